@@ -1,13 +1,17 @@
-from src.domain.cpa import detect_conflicts
 from src.ui.state import init_session_state
 from src.ui.footer import render_footer
-from src.ui.sidebar import render_sidebar
+from src.ui.sidebar import render_sidebar, render_debug_panel
 from src.ui.map import render_map
 from src.ui.table import render_table
+from src.data.dataset import load_traffic
+from src.data.time_index import TimeIndex
+from src.data.trajectory_index import TrajectoryIndex
+from src.domain.alignment import align_states
+from src.domain.cpa import DetectionStats
+from src.instrumentation import PipelineTrace, span
 from src.constants import NM_TO_M
 
 import streamlit as st
-import pandas as pd
 
 
 # ==================================================
@@ -20,6 +24,9 @@ st.caption(
     "Closest Point of Approach (CPA) prediction on ADS-B state vectors."
 )
 
+# Parquet dataset written by the data/ scripts; a CSV file also works
+DATA_PATH = "data/synthetic_opensky_germany"
+
 # ==================================================
 # MAIN APPLICATION
 # ==================================================
@@ -27,32 +34,41 @@ st.caption(
 
 def main():
     init_session_state()
-    df = load_data("data/synthetic_opensky_germany.csv")
 
-    times = sorted(df["time"].unique())[1:]
+    # Stage timings and detector counters are opt-in (sidebar toggle)
+    trace = PipelineTrace() if st.session_state.debug_timings else None
+    stats = DetectionStats() if trace is not None else None
+
+    with span(trace, "load_data"):
+        time_index = load_time_index(DATA_PATH)
+        trajectories = load_trajectory_index(DATA_PATH)
+
+    times = time_index.times[1:].tolist()
 
     # Render sidebar
     current_time, lookahead, sep_nm, sep_ft = render_sidebar(times)
 
     # Create snapshot at current time
-    snapshot = df[df["time"] == current_time].copy()
+    with span(trace, "snapshot"):
+        snapshot = time_index.snapshot(current_time)
 
     a_id = st.session_state.selected_pair["a"]
     b_id = st.session_state.selected_pair["b"]
 
-    # Detect conflicts
-    conflicts = detect_conflicts(
-        snapshot,
-        lookahead_s=lookahead,
-        sep_nm=sep_nm,
-        sep_ft=sep_ft
-    )
-    conflict_df = pd.DataFrame(conflicts) if conflicts else pd.DataFrame()
+    # Detect conflicts (neighbour list is reused across time steps)
+    with span(trace, "detect_conflicts"):
+        conflict_df = st.session_state.conflict_detector.detect(
+            snapshot,
+            lookahead_s=lookahead,
+            sep_nm=sep_nm,
+            sep_ft=sep_ft,
+            stats=stats
+        )
 
     # Render map & table
     col_map, col_table = st.columns([3, 2])
 
-    with col_table:
+    with col_table, span(trace, "render_table"):
         render_table(
             conflict_df=conflict_df,
             snapshot=snapshot,
@@ -63,21 +79,35 @@ def main():
     with col_map:
         render_map(
             snapshot=snapshot,
-            df=df,
+            trajectories=trajectories,
             current_time=current_time,
             conflict_df=conflict_df,
             a_id=a_id,
             b_id=b_id,
             lookahead=lookahead,
-            sep_m=sep_nm * NM_TO_M
+            sep_m=sep_nm * NM_TO_M,
+            future_paths=st.session_state.future_paths,
+            trace=trace
         )
 
+    if trace is not None:
+        trace.record_stats(stats)
+        trace.log()
+        render_debug_panel(trace)
+
     render_footer()
 
 
-@st.cache_data
-def load_data(path: str) -> pd.DataFrame:
-    return pd.read_csv(path)
+@st.cache_resource
+def load_time_index(path: str) -> TimeIndex:
+    # Shared across reruns and sessions without copying; treat as read-only.
+    # Positions are aligned to their snapshot times once, for all snapshots.
+    return TimeIndex.from_frame(align_states(load_traffic(path, compact=True)))
+
+
+@st.cache_resource
+def load_trajectory_index(path: str) -> TrajectoryIndex:
+    return TrajectoryIndex.from_frame(load_time_index(path).df)
 
 
 if __name__ == "__main__":
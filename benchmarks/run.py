@@ -0,0 +1,300 @@
+"""
+Benchmarks for the conflict detection pipeline, without the UI.
+
+Run from the project root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --quick
+    python -m benchmarks.run --aircraft 1000,20000 --output results.json
+
+Results are written as JSON (to benchmarks/results/ by default) so runs
+can be compared across commits.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+from src.data.dataset import load_traffic, write_dataset
+from src.data.synthetic import Region, generate_states, initial_aircraft
+from src.data.time_index import TimeIndex
+from src.data.trajectory_index import TrajectoryIndex
+from src.domain.cpa import DetectionStats, detect_conflicts
+from src.ui.map import (
+    create_base_layer,
+    create_cpa_circle_layer,
+    create_future_paths_layer,
+    create_trajectory_layer,
+    history_path,
+    select_future_paths,
+)
+from src.ui.utils import fit_point_budget, simplification_tolerance_m
+from src.constants import MAP_POINT_BUDGET
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+START_TIME = 1_656_342_000
+
+# Same traffic spread over regions of different size
+DENSITIES = {
+    "sparse": Region(47.0, 55.0, 5.0, 15.0),
+    "dense": Region(49.0, 51.0, 7.5, 10.0),
+}
+
+
+def timed(func, repeat: int):
+    """
+    Best wall time of ``repeat`` calls, then one traced call for peak memory.
+
+    Returns:
+        Tuple of (result, seconds, peak_bytes)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    func()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, best, peak_bytes
+
+
+def make_states(n_aircraft: int, density: str, steps: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    aircraft = initial_aircraft(n_aircraft, DENSITIES[density], [], 0.0, rng)
+    return pd.concat(
+        generate_states(aircraft, START_TIME, steps * 10, 10, rng),
+        ignore_index=True,
+    )
+
+
+def bench_detect(args, results):
+    for n in args.aircraft:
+        for density in args.densities:
+            snapshot = make_states(n, density, 1, args.seed)
+            total_pairs = n * (n - 1) // 2
+
+            for lookahead_s in args.lookahead:
+                for sep_nm in args.sep_nm:
+                    for sep_ft in args.sep_ft:
+                        stats = DetectionStats()
+                        conflicts, seconds, peak_bytes = timed(
+                            lambda: detect_conflicts(snapshot, lookahead_s, sep_nm, sep_ft),
+                            args.repeat,
+                        )
+                        detect_conflicts(snapshot, lookahead_s, sep_nm, sep_ft, stats=stats)
+
+                        results.append({
+                            "benchmark": "detect_conflicts",
+                            "params": {
+                                "aircraft": n,
+                                "density": density,
+                                "lookahead_s": lookahead_s,
+                                "sep_nm": sep_nm,
+                                "sep_ft": sep_ft,
+                            },
+                            "seconds": seconds,
+                            "pairs_per_s": total_pairs / seconds,
+                            "candidate_pairs": stats.broad_phase_pairs,
+                            "conflicts": len(conflicts),
+                            "peak_bytes": peak_bytes,
+                        })
+                        report(results[-1])
+
+
+def bench_snapshots(args, results):
+    for n in args.aircraft:
+        states = make_states(n, "sparse", args.steps, args.seed)
+        index = TimeIndex.from_frame(states)
+
+        def extract_all():
+            for i in range(len(index)):
+                index.snapshot_at(i)
+
+        _, seconds, peak_bytes = timed(extract_all, args.repeat)
+        results.append({
+            "benchmark": "snapshot_extraction",
+            "params": {"aircraft": n, "snapshots": len(index)},
+            "seconds": seconds,
+            "snapshots_per_s": len(index) / seconds,
+            "peak_bytes": peak_bytes,
+        })
+        report(results[-1])
+
+
+def bench_load(args, results):
+    for n in args.aircraft:
+        states = make_states(n, "sparse", args.steps, args.seed)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "states")
+            write_dataset(states, path)
+
+            def load():
+                # Same work as the app's cached loaders
+                index = TimeIndex.from_frame(load_traffic(path, compact=True))
+                TrajectoryIndex.from_frame(index.df)
+                return index
+
+            _, seconds, peak_bytes = timed(load, args.repeat)
+
+        results.append({
+            "benchmark": "load_data",
+            "params": {"aircraft": n, "rows": len(states)},
+            "seconds": seconds,
+            "rows_per_s": len(states) / seconds,
+            "peak_bytes": peak_bytes,
+        })
+        report(results[-1])
+
+
+def bench_map_layers(args, results):
+    for n in args.aircraft:
+        states = make_states(n, "sparse", args.steps, args.seed)
+        index = TimeIndex.from_frame(states)
+        trajectories = TrajectoryIndex.from_frame(index.df)
+        current_time = index.times[-1]
+        snapshot = index.snapshot(current_time)
+
+        conflict_df = detect_conflicts(snapshot)
+        if conflict_df.empty:
+            a_id, b_id = snapshot["icao24"].iloc[0], snapshot["icao24"].iloc[1]
+        else:
+            a_id, b_id = conflict_df["a"].iloc[0], conflict_df["b"].iloc[0]
+
+        # Projected paths for the selected pair only, or for every aircraft
+        for future_paths, icao_ids in (("selected", {a_id, b_id}), ("all", None)):
+            def build():
+                # Same steps as render_map, at its zoom for a selected pair
+                history, future = fit_point_budget(
+                    [
+                        [history_path(trajectories, icao, current_time) for icao in (a_id, b_id)],
+                        select_future_paths(snapshot, 300, icao_ids),
+                    ],
+                    simplification_tolerance_m(7.5, 51.0),
+                    MAP_POINT_BUDGET - len(snapshot),
+                )
+                layers = [
+                    create_base_layer(snapshot),
+                    create_trajectory_layer(history[0], [255, 100, 100, 150]),
+                    create_trajectory_layer(history[1], [100, 100, 255, 150]),
+                    create_future_paths_layer(future),
+                    create_cpa_circle_layer(conflict_df, a_id, b_id, snapshot, 9_260),
+                ]
+                # Serialization is part of what every rerun pays for
+                return pdk.Deck(layers=[layer for layer in layers if layer]).to_json()
+
+            spec, seconds, peak_bytes = timed(build, args.repeat)
+            results.append({
+                "benchmark": "map_layers",
+                "params": {"aircraft": n, "future_paths": future_paths},
+                "seconds": seconds,
+                "snapshots_per_s": 1 / seconds,
+                "json_bytes": len(spec),
+                "peak_bytes": peak_bytes,
+            })
+            report(results[-1])
+
+
+BENCHMARKS = {
+    "detect": bench_detect,
+    "snapshots": bench_snapshots,
+    "load": bench_load,
+    "map": bench_map_layers,
+}
+
+
+def report(result: dict):
+    params = " ".join(f"{key}={value}" for key, value in result["params"].items())
+    rates = " ".join(
+        f"{key}={value:,.0f}" for key, value in result.items() if key.endswith("_per_s")
+    )
+    print(
+        f"{result['benchmark']:<20} {params:<70} "
+        f"{result['seconds'] * 1e3:9.2f} ms  {rates}  peak={result['peak_bytes'] / 1e6:.1f} MB"
+    )
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def values(cast):
+    return lambda text: [cast(value) for value in text.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the conflict detection pipeline.")
+    parser.add_argument("--aircraft", type=values(int), default=[100, 1_000, 5_000, 20_000])
+    parser.add_argument("--densities", type=values(str), default=list(DENSITIES))
+    parser.add_argument("--lookahead", type=values(float), default=[60, 120, 300])
+    parser.add_argument("--sep-nm", type=values(float), default=[3.0, 5.0])
+    parser.add_argument("--sep-ft", type=values(float), default=[1_000])
+    parser.add_argument("--steps", type=int, default=60, help="snapshots per dataset")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only", type=values(str), default=list(BENCHMARKS),
+        help=f"comma-separated subset of {','.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--quick", action="store_true", help="small sizes for a smoke run")
+    parser.add_argument("--output", default=None, help="JSON output file")
+    args = parser.parse_args()
+
+    if args.quick:
+        args.aircraft = [100, 1_000]
+        args.lookahead = [120]
+        args.sep_nm = [5.0]
+        args.steps = 10
+        args.repeat = 1
+
+    commit = git_commit()
+    started = datetime.now(timezone.utc)
+
+    results = []
+    for name in args.only:
+        BENCHMARKS[name](args, results)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{started:%Y%m%dT%H%M%SZ}-{commit or 'unknown'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "commit": commit,
+                "started": started.isoformat(),
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+                "cpus": os.cpu_count(),
+                "args": vars(args),
+            },
+            "results": results,
+        }, f, indent=2)
+
+    print(f"Saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
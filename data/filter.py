@@ -1,40 +1,81 @@
+import os
+import sys
+import tempfile
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.data.dataset import APP_COLUMNS, write_dataset  # noqa: E402
+
 INPUT_FILE = "states_2022-06-27-15.csv"
-OUTPUT_FILE = "states_europe_1h_germany.csv"
+OUTPUT_DIR = "states_europe_1h_germany"
 
 LAT_MIN, LAT_MAX = 47.0, 55.0
 LON_MIN, LON_MAX = 5.0, 15.0
 MIN_STATES_PER_AIRCRAFT = 30
 
-print("Loading data...")
-df = pd.read_csv(INPUT_FILE)
+# Rows held in memory at once; peak memory does not depend on input size
+CHUNK_ROWS = 500_000
 
-df = (
-    df
-    .dropna(subset=["lat", "lon", "velocity", "heading"])
-    .query("onground == False")
-    .query("@LAT_MIN <= lat <= @LAT_MAX")
-    .query("@LON_MIN <= lon <= @LON_MAX")
-)
+# Same dtypes in both passes, so all-digit icao24 codes stay strings and
+# the per-aircraft counts match the keys of the second pass
+READ_KWARGS = {"chunksize": CHUNK_ROWS, "dtype": {"icao24": str, "callsign": str}}
 
-valid_icao24 = (
-    df.groupby("icao24")
-      .size()
-      .loc[lambda s: s >= MIN_STATES_PER_AIRCRAFT]
-      .index
-)
 
-df = (
-    df[df["icao24"].isin(valid_icao24)]
-    .sort_values(["icao24", "time"])
-)
+def filter_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    return (
+        chunk
+        .dropna(subset=["lat", "lon", "velocity", "heading"])
+        .query("onground == False")
+        .query("@LAT_MIN <= lat <= @LAT_MAX")
+        .query("@LON_MIN <= lon <= @LON_MAX")
+    )
+
+
+def append_csv(df: pd.DataFrame, path: str, first: bool):
+    df.to_csv(path, mode="w" if first else "a", header=first, index=False)
+
+
+def valid_chunks(path: str, valid_icao24: pd.Index, summary: dict):
+    for chunk in pd.read_csv(path, **READ_KWARGS):
+        chunk = chunk[chunk["icao24"].isin(valid_icao24)]
+        if chunk.empty:
+            continue
+        summary["rows"] += len(chunk)
+        summary["t_min"] = min(summary["t_min"], chunk["time"].min())
+        summary["t_max"] = max(summary["t_max"], chunk["time"].max())
+        yield chunk
+
+
+# Pass 1: filter every chunk to a temporary file of app columns and count
+# states per aircraft
+print("Filtering data...")
+counts = pd.Series(dtype="int64")
+tmp_fd, tmp_path = tempfile.mkstemp(suffix=".csv", dir=".")
+os.close(tmp_fd)
+
+try:
+    first = True
+    for chunk in pd.read_csv(INPUT_FILE, **READ_KWARGS):
+        chunk = filter_chunk(chunk)
+        if chunk.empty:
+            continue
+        counts = counts.add(chunk["icao24"].value_counts(), fill_value=0)
+        append_csv(chunk[APP_COLUMNS], tmp_path, first)
+        first = False
+
+    valid_icao24 = counts.index[counts >= MIN_STATES_PER_AIRCRAFT]
 
-df.to_csv(OUTPUT_FILE, index=False)
+    # Pass 2: keep aircraft with enough states, written as a Parquet dataset
+    print("Writing output...")
+    summary = {"rows": 0, "t_min": float("inf"), "t_max": float("-inf")}
+    chunks = valid_chunks(tmp_path, valid_icao24, summary) if not counts.empty else []
+    write_dataset(chunks, OUTPUT_DIR)
+finally:
+    os.remove(tmp_path)
 
 print(
-    f"Rows: {len(df):,} | "
-    f"Aircraft: {df['icao24'].nunique():,} | "
-    f"Time range: {df['time'].min()}–{df['time'].max()} | "
-    f"Saved: {OUTPUT_FILE}"
+    f"Rows: {summary['rows']:,} | "
+    f"Aircraft: {len(valid_icao24):,} | "
+    f"Time range: {summary['t_min']}–{summary['t_max']} | "
+    f"Saved: {OUTPUT_DIR}"
 )
@@ -1,101 +1,95 @@
+import argparse
+import os
+import sys
+import time
 import numpy as np
-import pandas as pd
 from datetime import datetime, timezone
 
-OUTPUT_FILE = "synthetic_opensky_germany.csv"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.data.dataset import write_dataset  # noqa: E402
+from src.data.synthetic import (  # noqa: E402
+    Airway,
+    Region,
+    Tma,
+    generate_states,
+    initial_aircraft,
+)
 
 START_TIME = int(
     datetime(2022, 6, 27, 15, 0, tzinfo=timezone.utc).timestamp()
 )
-DURATION_S = 3600          # 1 hour
-TIME_STEP_S = 10
-
-N_AIRCRAFT = 500
-
-LAT_MIN, LAT_MAX = 47.0, 55.0
-LON_MIN, LON_MAX = 5.0, 15.0
-
-ALT_MIN_M = 6_000
-ALT_MAX_M = 12_000
-
-SPEED_MIN = 180 / 3.6      # ~180 km/h
-SPEED_MAX = 900 / 3.6      # ~900 km/h
-
-np.random.seed(42)
-
-
-def random_icao():
-    return "".join(np.random.choice(list("abcdef0123456789"), 6))
-
-
-def random_callsign(i):
-    return f"SYN{i:03d}"
 
 
-aircraft = []
+def floats(text: str) -> list:
+    return [float(value) for value in text.split(",")]
 
-for i in range(N_AIRCRAFT):
-    aircraft.append({
-        "icao24": random_icao(),
-        "callsign": random_callsign(i),
-        "lat": np.random.uniform(LAT_MIN, LAT_MAX),
-        "lon": np.random.uniform(LON_MIN, LON_MAX),
-        "heading": np.random.uniform(0, 360),
-        "velocity": np.random.uniform(SPEED_MIN, SPEED_MAX),
-        "altitude": np.random.uniform(ALT_MIN_M, ALT_MAX_M),
-        "vertical_rate": np.random.normal(0.0, 0.3),
-    })
 
-# -----------------------------
-# Generate time series
-# -----------------------------
-
-rows = []
-
-times = np.arange(
-    START_TIME,
-    START_TIME + DURATION_S,
-    TIME_STEP_S,
+parser = argparse.ArgumentParser(
+    description="Generate synthetic OpenSky-style ADS-B states."
+)
+parser.add_argument("--aircraft", type=int, default=500, help="number of aircraft")
+parser.add_argument("--duration", type=int, default=3600, help="duration in seconds")
+parser.add_argument("--time-step", type=int, default=10, help="snapshot interval in seconds")
+parser.add_argument("--start-time", type=int, default=START_TIME, help="first Unix timestamp")
+parser.add_argument(
+    "--region", type=floats, default=[47.0, 55.0, 5.0, 15.0],
+    metavar="LAT_MIN,LAT_MAX,LON_MIN,LON_MAX",
+    help="bounding box for background traffic",
+)
+parser.add_argument(
+    "--tma", type=floats, action="append", default=[],
+    metavar="LAT,LON[,RADIUS_KM]", help="terminal-area hotspot (repeatable)",
+)
+parser.add_argument(
+    "--airway", type=floats, action="append", default=[],
+    metavar="LAT1,LON1,LAT2,LON2[,WIDTH_KM]", help="airway hotspot (repeatable)",
 )
+parser.add_argument(
+    "--hotspot-share", type=float, default=0.5,
+    help="fraction of aircraft placed in hotspots (if any are given)",
+)
+parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+parser.add_argument(
+    "--output", default=None,
+    help="output directory (parquet) or file (csv); "
+         "defaults to synthetic_opensky_germany[.csv]",
+)
+parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="rows per written chunk")
+parser.add_argument("--seed", type=int, default=42)
+args = parser.parse_args()
 
-for t in times:
-    for ac in aircraft:
-        heading_rad = np.radians(ac["heading"])
+output = args.output or (
+    "synthetic_opensky_germany" + (".csv" if args.format == "csv" else "")
+)
+rng = np.random.default_rng(args.seed)
+
+aircraft = initial_aircraft(
+    args.aircraft,
+    Region(*args.region),
+    [Tma(*values) for values in args.tma] + [Airway(*values) for values in args.airway],
+    args.hotspot_share,
+    rng,
+)
+chunks = generate_states(
+    aircraft, args.start_time, args.duration, args.time_step, rng, args.chunk_rows
+)
 
-        # Simple motion model (flat-earth approx)
-        d_lat = (
-            ac["velocity"] * np.cos(heading_rad) * TIME_STEP_S
-        ) / 111_000
-        d_lon = (
-            ac["velocity"] * np.sin(heading_rad) * TIME_STEP_S
-        ) / (111_000 * np.cos(np.radians(ac["lat"])))
+started = time.perf_counter()
+rows = 0
 
-        ac["lat"] += d_lat
-        ac["lon"] += d_lon
-        ac["altitude"] += ac["vertical_rate"] * TIME_STEP_S
 
-        rows.append({
-            "time": t,
-            "icao24": ac["icao24"],
-            "lat": ac["lat"],
-            "lon": ac["lon"],
-            "velocity": ac["velocity"],
-            "heading": ac["heading"],
-            "vertrate": ac["vertical_rate"],
-            "callsign": ac["callsign"],
-            "onground": False,
-            "alert": False,
-            "spi": False,
-            "squawk": "",
-            "baroaltitude": ac["altitude"],
-            "geoaltitude": ac["altitude"] + np.random.normal(0, 15),
-            "lastposupdate": t - np.random.uniform(0.5, 1.5),
-            "lastcontact": t,
-        })
+def counted(chunks):
+    global rows
+    for chunk in chunks:
+        rows += len(chunk)
+        yield chunk
 
-df = pd.DataFrame(rows)
 
-df.to_csv(OUTPUT_FILE, index=False)
+if args.format == "csv":
+    for i, chunk in enumerate(counted(chunks)):
+        chunk.to_csv(output, mode="w" if i == 0 else "a", header=i == 0, index=False)
+else:
+    write_dataset(counted(chunks), output)
 
-print(f"Generated {len(df):,} synthetic ADS-B states")
-print(f"Saved to {OUTPUT_FILE}")
+print(f"Generated {rows:,} synthetic ADS-B states in {time.perf_counter() - started:.1f} s")
+print(f"Saved to {output}")
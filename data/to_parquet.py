@@ -0,0 +1,17 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from src.data.dataset import csv_to_dataset  # noqa: E402
+
+# Converts an existing OpenSky-style CSV into the app's Parquet dataset:
+#   python to_parquet.py synthetic_opensky_germany.csv synthetic_opensky_germany
+
+if len(sys.argv) != 3:
+    sys.exit(f"Usage: python {os.path.basename(__file__)} INPUT_CSV OUTPUT_DIR")
+
+INPUT_FILE, OUTPUT_DIR = sys.argv[1:]
+
+print(f"Converting {INPUT_FILE}...")
+csv_to_dataset(INPUT_FILE, OUTPUT_DIR)
+print(f"Saved to {OUTPUT_DIR}")
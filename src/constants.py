@@ -8,3 +8,26 @@ NM_TO_M = 1852
 FT_TO_M = 0.3048
 
 MAX_RELATIVE_SPEED_MPS = 500
+
+DEFAULT_NEIGHBOUR_SKIN_M = 10_000
+
+DEFAULT_MAX_TILE_PAIRS = 250_000
+PAIR_WORKSPACE_BYTES = 160
+
+WGS84_A_M = 6_378_137.0
+WGS84_F = 1 / 298.257223563
+
+DEFAULT_TIME_BUCKET_S = 600
+
+DEFAULT_REPLAY_CAPACITY = 20_000
+DEFAULT_STATE_MAX_AGE_S = 60
+
+DEFAULT_MAX_POSITION_AGE_S = 15
+
+# Map payload: simplification tolerance in screen pixels, coordinate
+# decimals (5 decimals is about 1 m) and points sent per rerun
+MAP_SIMPLIFY_PIXELS = 1.0
+MAP_COORDINATE_DECIMALS = 5
+MAP_POINT_BUDGET = 20_000
+
+TABLE_PAGE_SIZE = 50
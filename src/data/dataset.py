@@ -0,0 +1,229 @@
+import os
+import shutil
+from itertools import chain
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from src.constants import DEFAULT_TIME_BUCKET_S
+
+
+# Columns used by the app, with their on-disk types
+APP_SCHEMA = pa.schema([
+    ("time", pa.int64()),
+    ("icao24", pa.string()),
+    ("callsign", pa.string()),
+    ("lat", pa.float64()),
+    ("lon", pa.float64()),
+    ("velocity", pa.float64()),
+    ("heading", pa.float64()),
+    ("vertrate", pa.float64()),
+    ("baroaltitude", pa.float64()),
+    ("lastposupdate", pa.float64()),
+])
+APP_COLUMNS = APP_SCHEMA.names
+
+_PARTITIONING = ds.partitioning(
+    pa.schema([("time_bucket", pa.int64())]), flavor="hive"
+)
+
+# Bucket width is stored in the file schema metadata, as readers need it
+# to prune buckets by their start time
+_BUCKET_METADATA_KEY = b"aircpa.bucket_s"
+
+# Optional in inputs; read back as nulls from datasets written without it
+_OPTIONAL_COLUMNS = ["lastposupdate"]
+
+# CSV dtypes so string columns stay strings in chunks without any values
+_CSV_DTYPES = {"icao24": str, "callsign": str}
+
+# Compact mode: float32 keeps positions within half an ulp of 2**-17 deg
+# (0.85 m of longitude at the equator for |lon| < 180), and speeds, headings
+# and altitudes far below that. Time and lastposupdate stay 64-bit, as
+# float32 would round epoch seconds to two minutes.
+COMPACT_FLOAT32_COLUMNS = ["lat", "lon", "velocity", "heading", "vertrate", "baroaltitude"]
+COMPACT_CATEGORICAL_COLUMNS = ["icao24", "callsign"]
+
+
+def _to_batches(frame: pd.DataFrame, bucket_s: int):
+    table = pa.Table.from_pandas(
+        frame.reindex(columns=APP_COLUMNS), schema=APP_SCHEMA, preserve_index=False
+    )
+    bucket = pc.multiply(pc.divide(table["time"], bucket_s), bucket_s)
+    return table.append_column("time_bucket", bucket).to_batches()
+
+
+def write_dataset(frames, path: str, bucket_s: int = DEFAULT_TIME_BUCKET_S):
+    """
+    Writes ADS-B states as a Parquet dataset partitioned by time bucket.
+
+    Only the app columns are kept. Any existing dataset at ``path`` is
+    removed first, so no buckets from an earlier write remain.
+
+    Args:
+        frames: DataFrame, or iterable of DataFrame chunks in any order
+        path: Output directory
+        bucket_s: Time bucket width in seconds
+    """
+    if isinstance(frames, pd.DataFrame):
+        frames = [frames]
+
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+    batches = chain.from_iterable(_to_batches(frame, bucket_s) for frame in frames)
+    ds.write_dataset(
+        batches,
+        path,
+        schema=APP_SCHEMA.append(pa.field("time_bucket", pa.int64())).with_metadata(
+            {_BUCKET_METADATA_KEY: str(bucket_s)}
+        ),
+        format="parquet",
+        partitioning=_PARTITIONING,
+        existing_data_behavior="error",
+        preserve_order=True,
+    )
+
+
+def csv_to_dataset(
+    csv_path: str,
+    path: str,
+    bucket_s: int = DEFAULT_TIME_BUCKET_S,
+    chunk_rows: int = 500_000,
+):
+    """
+    Converts an OpenSky-style CSV into a Parquet dataset, in chunks.
+
+    Args:
+        csv_path: Input CSV file
+        path: Output directory
+        bucket_s: Time bucket width in seconds
+        chunk_rows: Rows read at once
+    """
+    write_dataset(
+        pd.read_csv(
+            csv_path, usecols=_usecols(APP_COLUMNS), dtype=_CSV_DTYPES, chunksize=chunk_rows
+        ),
+        path,
+        bucket_s,
+    )
+
+
+def _usecols(columns: list):
+    """Column selector for read_csv that tolerates missing optional columns."""
+    if not set(columns) & set(_OPTIONAL_COLUMNS):
+        return columns
+    return lambda name: name in columns
+
+
+def _compact_table(table: pa.Table) -> pa.Table:
+    for i, name in enumerate(table.column_names):
+        if name in COMPACT_FLOAT32_COLUMNS:
+            table = table.set_column(i, name, table[name].cast(pa.float32()))
+        elif name in COMPACT_CATEGORICAL_COLUMNS:
+            table = table.set_column(i, name, pc.dictionary_encode(table[name]))
+    return table
+
+
+def read_dataset(
+    path: str,
+    columns: list | None = None,
+    t_start: float | None = None,
+    t_end: float | None = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Reads states from a Parquet dataset written by :func:`write_dataset`.
+
+    Only the requested columns are read. The time range is pushed down
+    to skip whole buckets and row groups. Datasets written without the
+    bucket width in their metadata are only pruned by the end time.
+
+    Args:
+        path: Dataset directory
+        columns: Columns to read, defaults to all app columns
+        t_start: Earliest timestamp to include
+        t_end: Latest timestamp to include
+        compact: Return compact dtypes (see :func:`load_traffic`)
+
+    Returns:
+        DataFrame of states
+    """
+    dataset = ds.dataset(path, format="parquet", partitioning=_PARTITIONING)
+    bucket_s = (dataset.schema.metadata or {}).get(_BUCKET_METADATA_KEY)
+
+    conditions = []
+    if t_start is not None:
+        if bucket_s is not None:
+            conditions.append(ds.field("time_bucket") > t_start - int(bucket_s))
+        conditions.append(ds.field("time") >= t_start)
+    if t_end is not None:
+        conditions.append(ds.field("time_bucket") <= t_end)
+        conditions.append(ds.field("time") <= t_end)
+
+    predicate = None
+    for condition in conditions:
+        predicate = condition if predicate is None else predicate & condition
+
+    # Directory listings are lexicographic; restore time order of the buckets
+    fragments = sorted(
+        dataset.get_fragments(filter=predicate),
+        key=lambda fragment: ds.get_partition_keys(fragment.partition_expression)["time_bucket"],
+    )
+    # Full schema, so columns missing from older files read as nulls
+    dataset = ds.FileSystemDataset(
+        fragments,
+        APP_SCHEMA.append(pa.field("time_bucket", pa.int64())),
+        dataset.format,
+        dataset.filesystem,
+    )
+
+    table = dataset.to_table(columns=columns or APP_COLUMNS, filter=predicate)
+    if compact:
+        # Convert in Arrow so strings never materialise as Python objects
+        table = _compact_table(table)
+    return table.to_pandas()
+
+
+def load_traffic(
+    path: str,
+    columns: list | None = None,
+    t_start: float | None = None,
+    t_end: float | None = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Loads states from a Parquet dataset directory or a CSV file.
+
+    Args:
+        path: Dataset directory or CSV file
+        columns: Columns to read, defaults to all app columns
+        t_start: Earliest timestamp to include
+        t_end: Latest timestamp to include
+        compact: Store kinematic columns as float32 and icao24/callsign as
+            categoricals, which takes several times less memory (positions
+            stay within 1 m)
+
+    Returns:
+        DataFrame of states
+    """
+    columns = columns or APP_COLUMNS
+
+    if os.path.isdir(path):
+        return read_dataset(path, columns, t_start, t_end, compact=compact)
+
+    dtypes = _CSV_DTYPES
+    if compact:
+        dtypes = {
+            **{name: "float32" for name in COMPACT_FLOAT32_COLUMNS},
+            **{name: "category" for name in COMPACT_CATEGORICAL_COLUMNS},
+        }
+    df = pd.read_csv(path, usecols=_usecols(columns), dtype=dtypes)
+    if len(df.columns) < len(columns):
+        # Missing optional columns read as nulls, as from a dataset
+        df = df.reindex(columns=columns)
+    if t_start is not None:
+        df = df[df["time"] >= t_start]
+    if t_end is not None:
+        df = df[df["time"] <= t_end]
+    return df
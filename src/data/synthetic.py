@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src.constants import FT_TO_M
+
+
+# Flat-earth metres per degree of latitude used by the motion model
+METERS_PER_DEG = 111_000
+
+ALT_MIN_M = 6_000
+ALT_MAX_M = 12_000
+
+SPEED_MIN_MPS = 180 / 3.6
+SPEED_MAX_MPS = 900 / 3.6
+
+# Airway traffic flies at whole flight levels, in steps of 1000 ft
+FLIGHT_LEVEL_STEP_M = 1_000 * FT_TO_M
+
+
+@dataclass
+class Region:
+    """Bounding box for uniformly distributed background traffic."""
+    lat_min: float = 47.0
+    lat_max: float = 55.0
+    lon_min: float = 5.0
+    lon_max: float = 15.0
+
+
+@dataclass
+class Tma:
+    """Terminal area: aircraft start within a circle on random headings."""
+    lat: float
+    lon: float
+    radius_km: float = 40.0
+
+
+@dataclass
+class Airway:
+    """Airway segment: aircraft fly along it in either direction."""
+    lat1: float
+    lon1: float
+    lat2: float
+    lon2: float
+    width_km: float = 5.0
+
+
+def _heading_between(lat1, lon1, lat2, lon2):
+    """Flat-earth heading from point 1 to point 2 in degrees."""
+    north = lat2 - lat1
+    east = (lon2 - lon1) * np.cos(np.radians((lat1 + lat2) / 2))
+    return np.degrees(np.arctan2(east, north)) % 360
+
+
+def initial_aircraft(
+    n_aircraft: int,
+    region: Region,
+    hotspots: list,
+    hotspot_share: float,
+    rng: np.random.Generator,
+) -> pd.DataFrame:
+    """
+    Draws initial states, placing ``hotspot_share`` of the aircraft in
+    the hotspots and the rest uniformly over the region.
+
+    Args:
+        n_aircraft: Number of aircraft
+        region: Bounding box for background traffic
+        hotspots: List of Tma and Airway hotspots
+        hotspot_share: Fraction of aircraft assigned to hotspots
+        rng: Random generator
+
+    Returns:
+        DataFrame with one row per aircraft
+    """
+    lat = rng.uniform(region.lat_min, region.lat_max, n_aircraft)
+    lon = rng.uniform(region.lon_min, region.lon_max, n_aircraft)
+    heading = rng.uniform(0, 360, n_aircraft)
+    altitude = rng.uniform(ALT_MIN_M, ALT_MAX_M, n_aircraft)
+
+    if hotspots:
+        assigned = rng.random(n_aircraft) < hotspot_share
+        hotspot_id = rng.integers(0, len(hotspots), n_aircraft)
+
+        for k, hotspot in enumerate(hotspots):
+            rows = np.flatnonzero(assigned & (hotspot_id == k))
+            n = len(rows)
+
+            if isinstance(hotspot, Tma):
+                # Uniform over the disc
+                r_m = hotspot.radius_km * 1_000 * np.sqrt(rng.random(n))
+                bearing = rng.uniform(0, 2 * np.pi, n)
+                lat[rows] = hotspot.lat + r_m * np.cos(bearing) / METERS_PER_DEG
+                lon[rows] = hotspot.lon + r_m * np.sin(bearing) / (
+                    METERS_PER_DEG * np.cos(np.radians(hotspot.lat))
+                )
+            else:
+                along = rng.random(n)
+                offset_m = rng.uniform(-0.5, 0.5, n) * hotspot.width_km * 1_000
+                forward = _heading_between(hotspot.lat1, hotspot.lon1, hotspot.lat2, hotspot.lon2)
+                normal = np.radians(forward + 90)
+                lat[rows] = (
+                    hotspot.lat1 + along * (hotspot.lat2 - hotspot.lat1)
+                    + offset_m * np.cos(normal) / METERS_PER_DEG
+                )
+                lon[rows] = (
+                    hotspot.lon1 + along * (hotspot.lon2 - hotspot.lon1)
+                    + offset_m * np.sin(normal) / (METERS_PER_DEG * np.cos(np.radians(lat[rows])))
+                )
+                heading[rows] = (forward + 180 * rng.integers(0, 2, n)) % 360
+                altitude[rows] = FLIGHT_LEVEL_STEP_M * np.round(
+                    rng.uniform(ALT_MIN_M, ALT_MAX_M, n) / FLIGHT_LEVEL_STEP_M
+                )
+
+    icao24 = rng.choice(2 ** 24, n_aircraft, replace=False)
+
+    return pd.DataFrame({
+        "icao24": [f"{code:06x}" for code in icao24],
+        "callsign": [f"SYN{i:03d}" for i in range(n_aircraft)],
+        "lat": lat,
+        "lon": lon,
+        "heading": heading,
+        "velocity": rng.uniform(SPEED_MIN_MPS, SPEED_MAX_MPS, n_aircraft),
+        "altitude": altitude,
+        "vertical_rate": rng.normal(0.0, 0.3, n_aircraft),
+    })
+
+
+def generate_states(
+    aircraft: pd.DataFrame,
+    start_time: int,
+    duration_s: int,
+    time_step_s: int,
+    rng: np.random.Generator,
+    chunk_rows: int = 1_000_000,
+):
+    """
+    Propagates aircraft on constant headings and yields OpenSky-style
+    states in time order.
+
+    Every time step is computed for all aircraft at once; chunks cover
+    whole time steps, so memory depends on ``chunk_rows`` only.
+
+    Args:
+        aircraft: Initial states from :func:`initial_aircraft`
+        start_time: First timestamp [s]
+        duration_s: Length of the generated period [s]
+        time_step_s: Interval between snapshots [s]
+        rng: Random generator for measurement noise
+        chunk_rows: Approximate number of rows per chunk
+
+    Yields:
+        DataFrames of states
+    """
+    n = len(aircraft)
+    times = np.arange(start_time, start_time + duration_s, time_step_s)
+    steps_per_chunk = max(1, chunk_rows // max(n, 1))
+
+    icao24 = aircraft["icao24"].to_numpy()
+    callsign = aircraft["callsign"].to_numpy()
+    velocity = aircraft["velocity"].to_numpy()
+    heading = aircraft["heading"].to_numpy()
+    vertical_rate = aircraft["vertical_rate"].to_numpy()
+    heading_rad = np.radians(heading)
+
+    lat = aircraft["lat"].to_numpy(dtype=float)
+    lon = aircraft["lon"].to_numpy(dtype=float)
+    altitude = aircraft["altitude"].to_numpy(dtype=float)
+
+    d_lat = velocity * np.cos(heading_rad) * time_step_s / METERS_PER_DEG
+    east_m = velocity * np.sin(heading_rad) * time_step_s
+
+    for first in range(0, len(times), steps_per_chunk):
+        chunk_times = times[first:first + steps_per_chunk]
+        k = np.arange(len(chunk_times))[:, None]
+
+        # Latitude is linear in time; the longitude step uses the latitude
+        # at the start of each step, so it is accumulated
+        lat_before = lat + k * d_lat
+        lon_steps = east_m / (METERS_PER_DEG * np.cos(np.radians(lat_before)))
+        chunk_lat = lat_before + d_lat
+        chunk_lon = lon + np.cumsum(lon_steps, axis=0)
+        chunk_altitude = altitude + (k + 1) * vertical_rate * time_step_s
+
+        lat, lon, altitude = chunk_lat[-1], chunk_lon[-1], chunk_altitude[-1]
+
+        shape = chunk_lat.shape
+        time = np.repeat(chunk_times, n)
+        yield pd.DataFrame({
+            "time": time,
+            "icao24": np.tile(icao24, len(chunk_times)),
+            "lat": chunk_lat.ravel(),
+            "lon": chunk_lon.ravel(),
+            "velocity": np.tile(velocity, len(chunk_times)),
+            "heading": np.tile(heading, len(chunk_times)),
+            "vertrate": np.tile(vertical_rate, len(chunk_times)),
+            "callsign": np.tile(callsign, len(chunk_times)),
+            "onground": False,
+            "alert": False,
+            "spi": False,
+            "squawk": "",
+            "baroaltitude": chunk_altitude.ravel(),
+            "geoaltitude": chunk_altitude.ravel() + rng.normal(0, 15, shape).ravel(),
+            "lastposupdate": time,
+            "lastcontact": time,
+        })
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class TimeIndex:
+    """
+    States sorted by time with the row range of every timestamp, so a
+    snapshot is a slice instead of a scan over the whole table.
+    """
+    df: pd.DataFrame
+    times: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "TimeIndex":
+        """
+        Sorts states by time once and records each timestamp's row range.
+
+        Rows with equal timestamps keep their original order.
+
+        Args:
+            df: ADS-B states with a "time" column
+
+        Returns:
+            TimeIndex over a time-sorted copy of ``df``
+        """
+        if not df["time"].is_monotonic_increasing:
+            df = df.sort_values("time", kind="stable")
+        df = df.reset_index(drop=True)
+
+        time = df["time"].to_numpy()
+        starts = np.flatnonzero(np.concatenate(([len(time) > 0], time[1:] != time[:-1])))
+        ends = np.empty_like(starts)
+        ends[:-1] = starts[1:]
+        ends[-1:] = len(time)
+
+        return cls(df, time[starts], starts, ends)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def position(self, time) -> int:
+        """
+        Position of a timestamp in :attr:`times`.
+
+        Raises:
+            KeyError: If the timestamp has no states
+        """
+        i = int(np.searchsorted(self.times, time))
+        if i == len(self.times) or self.times[i] != time:
+            raise KeyError(time)
+        return i
+
+    def snapshot_at(self, i: int) -> pd.DataFrame:
+        """States of the i-th timestamp, as a slice of :attr:`df`."""
+        return self.df.iloc[self.starts[i]:self.ends[i]]
+
+    def snapshot(self, time) -> pd.DataFrame:
+        """
+        States at a single timestamp.
+
+        Args:
+            time: Timestamp present in the data
+
+        Returns:
+            Slice of :attr:`df`, without copying
+        """
+        return self.snapshot_at(self.position(time))
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+
+
+# Columns kept for history paths and position lookups
+TRAJECTORY_COLUMNS = ["time", "lat", "lon"]
+
+
+@dataclass
+class TrajectoryIndex:
+    """
+    States grouped by aircraft and sorted by time, with the row range of
+    every aircraft, so history lookups are a binary search and a slice.
+    """
+    df: pd.DataFrame
+    icao24: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    _positions: dict = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._positions = {icao: i for i, icao in enumerate(self.icao24.tolist())}
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "TrajectoryIndex":
+        """
+        Groups states by icao24 and sorts each group by time.
+
+        Args:
+            df: ADS-B states with "icao24", "time", "lat" and "lon" columns
+
+        Returns:
+            TrajectoryIndex over the trajectory columns of ``df``
+        """
+        df = (
+            df[["icao24", *TRAJECTORY_COLUMNS]]
+            .sort_values(["icao24", "time"], kind="stable")
+            .reset_index(drop=True)
+        )
+
+        icao24 = df["icao24"].to_numpy()
+        starts = np.flatnonzero(np.concatenate(([len(icao24) > 0], icao24[1:] != icao24[:-1])))
+        ends = np.empty_like(starts)
+        ends[:-1] = starts[1:]
+        ends[-1:] = len(icao24)
+
+        return cls(df[TRAJECTORY_COLUMNS], icao24[starts], starts, ends)
+
+    def __len__(self) -> int:
+        return len(self.icao24)
+
+    def _range_until(self, icao: str, time):
+        i = self._positions.get(icao)
+        if i is None:
+            return 0, 0
+
+        start, end = self.starts[i], self.ends[i]
+        times = self.df["time"].to_numpy()[start:end]
+        return start, start + int(np.searchsorted(times, time, side="right"))
+
+    def history(self, icao: str, time) -> pd.DataFrame:
+        """
+        States of one aircraft up to and including ``time``.
+
+        Args:
+            icao: Aircraft ICAO24
+            time: Latest timestamp to include
+
+        Returns:
+            Time-sorted slice of :attr:`df`, empty if there are no states
+        """
+        start, end = self._range_until(icao, time)
+        return self.df.iloc[start:end]
+
+    def last_position(self, icao: str, time):
+        """
+        Last known position of an aircraft at or before ``time``.
+
+        Args:
+            icao: Aircraft ICAO24
+            time: Latest timestamp to consider
+
+        Returns:
+            Tuple of (lat, lon), or None if the aircraft has no states yet
+        """
+        start, end = self._range_until(icao, time)
+        if end == start:
+            return None
+
+        row = self.df.iloc[end - 1]
+        return float(row["lat"]), float(row["lon"])
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 import numpy as np
-from src.domain.geometry import latlon_to_xy
+from src.domain.geometry import latlon_to_xy, LocalProjection
 
 
-@dataclass
+@dataclass(slots=True)
 class AircraftState:
     """
     Represents the instantaneous kinematic state of an aircraft
@@ -29,3 +29,116 @@ class AircraftState:
             self.velocity_mps * np.sin(h),
             self.velocity_mps * np.cos(h)
         ])
+
+
+@dataclass(slots=True)
+class TrafficSnapshot:
+    """
+    Column-oriented kinematic state of all aircraft in a snapshot.
+
+    Each field holds one contiguous array with one entry per aircraft,
+    so the domain layer works on whole snapshots instead of per-aircraft
+    objects. Motion assumptions are the same as for AircraftState.
+    """
+    icao24: np.ndarray
+    lat_deg: np.ndarray
+    lon_deg: np.ndarray
+    velocity_mps: np.ndarray
+    heading_deg: np.ndarray
+    altitude_m: np.ndarray
+    vertical_rate_mps: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df) -> "TrafficSnapshot":
+        """
+        Build a snapshot from an OpenSky-schema DataFrame.
+
+        float64 columns are used as-is without copying.
+
+        Args:
+            df: DataFrame with icao24, lat, lon, velocity, heading,
+                baroaltitude and vertrate columns
+
+        Returns:
+            TrafficSnapshot
+        """
+        def column(name):
+            return df[name].to_numpy(dtype=np.float64, copy=False)
+
+        return cls(
+            icao24=df["icao24"].to_numpy(),
+            lat_deg=column("lat"),
+            lon_deg=column("lon"),
+            velocity_mps=column("velocity"),
+            heading_deg=column("heading"),
+            altitude_m=column("baroaltitude"),
+            vertical_rate_mps=column("vertrate"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.icao24)
+
+    def take(self, rows) -> "TrafficSnapshot":
+        """
+        Select aircraft by index array, boolean mask or slice.
+
+        Slices return views; index arrays and masks return copies.
+        """
+        return TrafficSnapshot(
+            icao24=self.icao24[rows],
+            lat_deg=self.lat_deg[rows],
+            lon_deg=self.lon_deg[rows],
+            velocity_mps=self.velocity_mps[rows],
+            heading_deg=self.heading_deg[rows],
+            altitude_m=self.altitude_m[rows],
+            vertical_rate_mps=self.vertical_rate_mps[rows],
+        )
+
+    def reference_point(self) -> tuple:
+        """
+        Mean position of the snapshot, ignoring missing coordinates.
+
+        Returns:
+            Tuple of (lat0, lon0), NaN if no aircraft has a position
+        """
+        return _nanmean(self.lat_deg), _nanmean(self.lon_deg)
+
+    def projection(self, mode: str = "flat") -> LocalProjection:
+        """Local projection centred on the snapshot mean position."""
+        return LocalProjection(*self.reference_point(), mode)
+
+    def position_xy(self, projection: LocalProjection):
+        """
+        Project all positions onto the local XY plane.
+
+        Returns:
+            Tuple of (x, y) arrays in meters
+        """
+        return projection.to_xy(self.lat_deg, self.lon_deg)
+
+    def velocity_xy(self, projection: LocalProjection | None = None):
+        """
+        Horizontal velocity components of all aircraft.
+
+        Args:
+            projection: LocalProjection whose XY frame to use; None for
+                each aircraft's own east/north frame
+
+        Returns:
+            Tuple of (vx, vy) arrays in m/s
+        """
+        h = np.radians(self.heading_deg)
+        v_east = self.velocity_mps * np.sin(h)
+        v_north = self.velocity_mps * np.cos(h)
+        if projection is None:
+            return v_east, v_north
+        return projection.velocity_to_xy(self.lat_deg, self.lon_deg, v_east, v_north)
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """NaN-skipping mean that returns NaN instead of warning when empty."""
+    finite = np.isfinite(values)
+    count = np.count_nonzero(finite)
+    if count == 0:
+        return np.nan
+    return values[finite].sum() / count
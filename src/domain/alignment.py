@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from src.constants import DEFAULT_MAX_POSITION_AGE_S, EARTH_RADIUS_M
+
+
+def extrapolate_positions(
+    lat_deg: np.ndarray,
+    lon_deg: np.ndarray,
+    altitude_m: np.ndarray,
+    velocity_mps: np.ndarray,
+    heading_deg: np.ndarray,
+    vertical_rate_mps: np.ndarray,
+    dt_s: np.ndarray,
+) -> tuple:
+    """
+    Moves positions along their own velocity vectors by ``dt_s``.
+
+    The displacement uses the same flat-earth approximation as
+    :func:`src.domain.geometry.latlon_to_xy`. An aircraft with an unknown
+    speed, heading or vertical rate is not moved along that component.
+
+    Args:
+        lat_deg: Latitudes
+        lon_deg: Longitudes
+        altitude_m: Altitudes [m]
+        velocity_mps: Ground speeds [m/s]
+        heading_deg: True tracks [deg]
+        vertical_rate_mps: Vertical rates [m/s]
+        dt_s: Time to extrapolate per aircraft [s]
+
+    Returns:
+        Tuple of (lat, lon, altitude) float64 arrays
+    """
+    h = np.radians(heading_deg)
+    north_m = np.nan_to_num(velocity_mps * np.cos(h) * dt_s)
+    east_m = np.nan_to_num(velocity_mps * np.sin(h) * dt_s)
+    up_m = np.nan_to_num(vertical_rate_mps * dt_s)
+
+    lat = np.asarray(lat_deg, dtype=np.float64)
+    return (
+        lat + np.degrees(north_m / EARTH_RADIUS_M),
+        lon_deg + np.degrees(east_m / (EARTH_RADIUS_M * np.cos(np.radians(lat)))),
+        altitude_m + up_m,
+    )
+
+
+def align_states(
+    df: pd.DataFrame,
+    max_age_s: float = DEFAULT_MAX_POSITION_AGE_S,
+) -> pd.DataFrame:
+    """
+    Aligns every state to the epoch of its snapshot.
+
+    OpenSky positions are valid at ``lastposupdate``, which can lag the
+    snapshot ``time`` by seconds. Each position is extrapolated to
+    ``time`` with the aircraft's own velocity, heading and vertical rate,
+    and states whose position is older than ``max_age_s`` are dropped.
+    All rows are handled at once, for any number of snapshots.
+
+    States without ``lastposupdate`` are assumed current; a frame
+    without the column is returned unchanged.
+
+    Args:
+        df: ADS-B states with time and lastposupdate columns
+        max_age_s: Staleness limit for positions [s]
+
+    Returns:
+        DataFrame of the fresh states with aligned lat, lon and
+        baroaltitude, in the input dtypes
+    """
+    if "lastposupdate" not in df:
+        return df
+
+    age_s = df["time"].to_numpy(dtype=np.float64) - df["lastposupdate"].to_numpy(dtype=np.float64)
+    age_s = np.nan_to_num(age_s)
+    fresh = age_s <= max_age_s
+
+    aligned = df[fresh].copy()
+    age_s = age_s[fresh]
+
+    def column(name):
+        return aligned[name].to_numpy(dtype=np.float64)
+
+    lat, lon, altitude = extrapolate_positions(
+        column("lat"),
+        column("lon"),
+        column("baroaltitude"),
+        column("velocity"),
+        column("heading"),
+        column("vertrate"),
+        age_s,
+    )
+    for name, values in (("lat", lat), ("lon", lon), ("baroaltitude", altitude)):
+        aligned[name] = values.astype(df[name].dtype, copy=False)
+
+    return aligned
@@ -0,0 +1,251 @@
+import numpy as np
+from src.constants import DEFAULT_MAX_TILE_PAIRS
+
+
+# Half of the 3x3 neighbourhood; the other half is covered by symmetry
+_HALF_STENCIL = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+# Rounding margin so band tests never reject a pair the CPA kernel keeps
+_ALTITUDE_MARGIN_M = 1e-3
+
+
+def _iter_ranges(start: np.ndarray, end: np.ndarray, tile_pairs: int):
+    """
+    Expand half-open ranges [start, end) into flat index arrays, at most
+    ``tile_pairs`` entries at a time.
+
+    Yields:
+        Tuples of (range_id, position) arrays
+    """
+    offsets = np.concatenate(([0], np.cumsum(end - start)))
+    total = int(offsets[-1])
+
+    for first in range(0, total, tile_pairs):
+        flat = np.arange(first, min(first + tile_pairs, total))
+        range_id = np.searchsorted(offsets, flat, side="right") - 1
+        yield range_id, start[range_id] + (flat - offsets[range_id])
+
+
+def _collect(tiles):
+    """
+    Concatenate (ownship, intruder) tiles into a single pair of arrays.
+    """
+    own_parts, intr_parts = [], []
+    for own, intr in tiles:
+        own_parts.append(own)
+        intr_parts.append(intr)
+
+    if not own_parts:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+    return np.concatenate(own_parts), np.concatenate(intr_parts)
+
+
+def iter_all_pairs(n: int, tile_pairs: int = DEFAULT_MAX_TILE_PAIRS):
+    """
+    Enumerate every aircraft pair in tiles of rows against the upper
+    triangle.
+
+    Args:
+        n: Number of aircraft
+        tile_pairs: Maximum number of pairs per tile
+
+    Yields:
+        Tuples of (ownship, intruder) index arrays with ownship < intruder,
+        in the same order as itertools.combinations
+    """
+    start = np.arange(1, n + 1)
+    end = np.full(n, n)
+    yield from _iter_ranges(start, end, tile_pairs)
+
+
+def all_pairs(n: int):
+    """
+    Enumerate every aircraft pair.
+
+    Args:
+        n: Number of aircraft
+
+    Returns:
+        Tuple of (ownship, intruder) index arrays with ownship < intruder,
+        in the same order as itertools.combinations
+    """
+    return np.triu_indices(n, k=1)
+
+
+def iter_grid_pairs(
+    x_m: np.ndarray,
+    y_m: np.ndarray,
+    cell_size_m: float,
+    tile_pairs: int = DEFAULT_MAX_TILE_PAIRS,
+):
+    """
+    Enumerate candidate pairs using a uniform grid over the local XY plane.
+
+    Aircraft are binned into square cells and only pairs in the same or
+    adjacent cells are returned. Any pair closer than ``cell_size_m`` is
+    guaranteed to be included. Aircraft with non-finite positions are
+    skipped.
+
+    Raises:
+        ValueError: If ``cell_size_m`` is not positive
+
+    Args:
+        x_m: X coordinates in meters
+        y_m: Y coordinates in meters
+        cell_size_m: Grid cell edge length in meters
+        tile_pairs: Maximum number of pairs per tile
+
+    Yields:
+        Tuples of (ownship, intruder) index arrays with ownship < intruder,
+        in no particular order
+    """
+    if not cell_size_m > 0:
+        raise ValueError(f"Grid cell size must be positive: {cell_size_m}")
+
+    valid = np.flatnonzero(np.isfinite(x_m) & np.isfinite(y_m))
+    if len(valid) < 2:
+        return
+
+    x = x_m[valid]
+    y = y_m[valid]
+
+    # Offset by one cell so neighbour keys never go negative
+    cell_x = np.floor((x - x.min()) / cell_size_m).astype(np.int64) + 1
+    cell_y = np.floor((y - y.min()) / cell_size_m).astype(np.int64) + 1
+    n_rows = int(cell_y.max()) + 2
+    keys = cell_x * n_rows + cell_y
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    # Pairs within the same cell
+    start = np.searchsorted(sorted_keys, keys, side="left")
+    end = np.searchsorted(sorted_keys, keys, side="right")
+    for src, pos in _iter_ranges(start, end, tile_pairs):
+        dst = order[pos]
+        same_cell = src < dst
+        yield valid[src[same_cell]], valid[dst[same_cell]]
+
+    # Pairs with the forward half of the neighbouring cells
+    for dx, dy in _HALF_STENCIL:
+        neighbour_keys = keys + dx * n_rows + dy
+        start = np.searchsorted(sorted_keys, neighbour_keys, side="left")
+        end = np.searchsorted(sorted_keys, neighbour_keys, side="right")
+        for src, pos in _iter_ranges(start, end, tile_pairs):
+            dst = order[pos]
+            yield valid[np.minimum(src, dst)], valid[np.maximum(src, dst)]
+
+
+def grid_pairs(x_m: np.ndarray, y_m: np.ndarray, cell_size_m: float):
+    """
+    Non-tiled variant of :func:`iter_grid_pairs`.
+
+    Returns:
+        Tuple of (ownship, intruder) index arrays with ownship < intruder,
+        in no particular order
+    """
+    return _collect(iter_grid_pairs(x_m, y_m, cell_size_m))
+
+
+def altitude_intervals(
+    altitude_m: np.ndarray,
+    vertical_rate_mps: np.ndarray,
+    lookahead_s: float,
+):
+    """
+    Altitude band each aircraft can reach within the look-ahead horizon
+    assuming a constant vertical rate.
+
+    Aircraft with unknown altitude or vertical rate get an unbounded band,
+    so they are never pruned vertically.
+
+    Args:
+        altitude_m: Altitudes in meters
+        vertical_rate_mps: Vertical rates in m/s
+        lookahead_s: Look-ahead horizon [s]
+
+    Returns:
+        Tuple of (lower_m, upper_m) arrays
+    """
+    climb_m = vertical_rate_mps * lookahead_s
+    lower_m = altitude_m + np.minimum(climb_m, 0.0)
+    upper_m = altitude_m + np.maximum(climb_m, 0.0)
+
+    unknown = ~(np.isfinite(lower_m) & np.isfinite(upper_m))
+    lower_m[unknown] = -np.inf
+    upper_m[unknown] = np.inf
+
+    return lower_m - _ALTITUDE_MARGIN_M, upper_m + _ALTITUDE_MARGIN_M
+
+
+def iter_altitude_band_pairs(
+    lower_m: np.ndarray,
+    upper_m: np.ndarray,
+    sep_m: float,
+    tile_pairs: int = DEFAULT_MAX_TILE_PAIRS,
+):
+    """
+    Enumerate pairs whose altitude bands come closer than ``sep_m``.
+
+    Bands are swept in order of their lower bound, so only overlapping
+    pairs are generated.
+
+    Args:
+        lower_m: Lower band bounds in meters
+        upper_m: Upper band bounds in meters
+        sep_m: Vertical separation minimum in meters
+        tile_pairs: Maximum number of pairs per tile
+
+    Yields:
+        Tuples of (ownship, intruder) index arrays with ownship < intruder,
+        in no particular order
+    """
+    order = np.argsort(lower_m, kind="stable")
+    sorted_lower_m = lower_m[order]
+
+    start = np.arange(1, len(order) + 1)
+    end = np.searchsorted(sorted_lower_m, upper_m[order] + sep_m, side="left")
+    end = np.maximum(end, start)
+
+    for src, pos in _iter_ranges(start, end, tile_pairs):
+        src = order[src]
+        dst = order[pos]
+        yield np.minimum(src, dst), np.maximum(src, dst)
+
+
+def altitude_band_pairs(lower_m: np.ndarray, upper_m: np.ndarray, sep_m: float):
+    """
+    Non-tiled variant of :func:`iter_altitude_band_pairs`.
+
+    Returns:
+        Tuple of (ownship, intruder) index arrays with ownship < intruder,
+        in no particular order
+    """
+    return _collect(iter_altitude_band_pairs(lower_m, upper_m, sep_m))
+
+
+def altitude_band_mask(
+    own: np.ndarray,
+    intr: np.ndarray,
+    lower_m: np.ndarray,
+    upper_m: np.ndarray,
+    sep_m: float,
+) -> np.ndarray:
+    """
+    Vertical filter for existing candidate pairs.
+
+    Args:
+        own: Ownship indices
+        intr: Intruder indices
+        lower_m: Lower band bounds in meters
+        upper_m: Upper band bounds in meters
+        sep_m: Vertical separation minimum in meters
+
+    Returns:
+        Boolean mask, True where the bands come closer than ``sep_m``
+    """
+    gap_m = np.maximum(
+        lower_m[intr] - upper_m[own],
+        lower_m[own] - upper_m[intr],
+    )
+    return gap_m < sep_m
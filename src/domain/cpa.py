@@ -1,5 +1,15 @@
+from dataclasses import dataclass
 import numpy as np
-from src.domain.aircraft import AircraftState
+import pandas as pd
+from src.domain.aircraft import AircraftState, TrafficSnapshot
+from src.domain.broadphase import (
+    iter_all_pairs,
+    iter_grid_pairs,
+    altitude_intervals,
+    iter_altitude_band_pairs,
+    altitude_band_mask,
+)
+from src.domain.geometry import LocalProjection
 from itertools import combinations
 import numpy as np
 from src.constants import (
@@ -9,8 +19,14 @@ from src.constants import (
     NM_TO_M,
     FT_TO_M,
     MAX_RELATIVE_SPEED_MPS,
+    DEFAULT_NEIGHBOUR_SKIN_M,
+    DEFAULT_MAX_TILE_PAIRS,
+    PAIR_WORKSPACE_BYTES,
 )
 
+# Conflict columns that rank_conflicts orders by; smaller is more severe
+SEVERITY_KEYS = ("t_cpa", "d_cpa_nm", "vert_sep_ft")
+
 
 def compute_cpa(
     relative_position_m: np.ndarray,
@@ -41,17 +57,669 @@ def compute_cpa(
     return t_cpa_s, d_cpa_m
 
 
+def compute_cpa_batch(
+    relative_position_m: np.ndarray,
+    relative_velocity_mps: np.ndarray,
+):
+    """
+    Vectorized version of :func:`compute_cpa` for many aircraft pairs.
+
+    Args:
+        relative_position_m: Relative position vectors, shape (M, 2) [m]
+        relative_velocity_mps: Relative velocity vectors, shape (M, 2) [m/s]
+
+    Returns:
+        t_cpa_s: Time to CPA in seconds, shape (M,) (NaN if undefined)
+        d_cpa_m: Horizontal distance at CPA in meters, shape (M,)
+    """
+    px = relative_position_m[:, 0]
+    py = relative_position_m[:, 1]
+    vx = relative_velocity_mps[:, 0]
+    vy = relative_velocity_mps[:, 1]
+
+    rel_speed_sq = vx * vx + vy * vy
+    undefined = rel_speed_sq == 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_cpa_s = -(px * vx + py * vy) / rel_speed_sq
+    t_cpa_s[undefined] = np.nan
+
+    # Zero relative velocity keeps the current distance
+    t_eval_s = np.where(undefined, 0.0, t_cpa_s)
+    cx = px + vx * t_eval_s
+    cy = py + vy * t_eval_s
+    d_cpa_m = np.sqrt(cx * cx + cy * cy)
+
+    return t_cpa_s, d_cpa_m
+
+
+def _as_traffic(snapshot) -> TrafficSnapshot:
+    """Accepts a TrafficSnapshot or an OpenSky-schema DataFrame."""
+    if isinstance(snapshot, TrafficSnapshot):
+        return snapshot
+    return TrafficSnapshot.from_frame(snapshot)
+
+
+def _project_snapshot(traffic: TrafficSnapshot, projection: str = "flat"):
+    """
+    Projects positions and velocities into the local XY plane centred on
+    the snapshot mean.
+
+    Args:
+        traffic: Snapshot at a single timestamp
+        projection: LocalProjection mode, "flat" or "enu"
+
+    Returns:
+        Tuple of (x_m, y_m, vx_mps, vy_mps)
+    """
+    local = traffic.projection(projection)
+    x_m, y_m = traffic.position_xy(local)
+    vx_mps, vy_mps = traffic.velocity_xy(local)
+    return x_m, y_m, vx_mps, vy_mps
+
+
+@dataclass
+class DetectionStats:
+    """
+    Pair counters collected during a single detect_conflicts call.
+    """
+    n_aircraft: int = 0
+    total_pairs: int = 0
+    broad_phase_pairs: int = 0
+    pruned_by_altitude: int = 0
+    pruned_by_distance: int = 0
+    rejected_by_t_cpa: int = 0
+    rejected_horizontally: int = 0
+    rejected_vertically: int = 0
+    conflicts: int = 0
+    tiles: int = 0
+    max_tile_pairs: int = 0
+
+    @property
+    def pruned_by_broad_phase(self) -> int:
+        return self.total_pairs - self.broad_phase_pairs
+
+    @property
+    def peak_tile_bytes(self) -> int:
+        """Estimated peak working memory of the largest pair tile."""
+        return self.max_tile_pairs * PAIR_WORKSPACE_BYTES
+
+    def record_tile(self, n_pairs: int):
+        self.tiles += 1
+        self.max_tile_pairs = max(self.max_tile_pairs, n_pairs)
+
+
+def tile_pairs_for_memory(budget_bytes: int) -> int:
+    """
+    Largest pair tile whose working memory fits in ``budget_bytes``.
+
+    Args:
+        budget_bytes: Memory budget for pair evaluation [bytes]
+
+    Returns:
+        Value for the ``max_tile_pairs`` argument of the detectors
+    """
+    return max(1, int(budget_bytes) // PAIR_WORKSPACE_BYTES)
+
+
+def _evaluate_pairs(
+    own: np.ndarray,
+    intr: np.ndarray,
+    x_m: np.ndarray,
+    y_m: np.ndarray,
+    vx_mps: np.ndarray,
+    vy_mps: np.ndarray,
+    altitude_m: np.ndarray,
+    vertical_rate_mps: np.ndarray,
+    lookahead_s: float,
+    horizontal_sep_m: float,
+    vertical_sep_m: float,
+    max_initial_distance_m: float,
+    stats: DetectionStats | None = None,
+):
+    """
+    CPA kernel: evaluates the candidate pairs (own[k], intr[k]).
+
+    Candidates may come in any order with own < intr; conflicts are
+    returned in the same order.
+
+    Returns:
+        Dictionary of conflict arrays: own, intr, t_cpa_s, d_cpa_m,
+        vertical_sep_at_cpa_m, cpa_x_m, cpa_y_m, initial_distance_m
+    """
+    rel_position_m = np.column_stack((x_m[intr] - x_m[own], y_m[intr] - y_m[own]))
+
+    # Horizontal distance pre-filter (NaN positions are left to the CPA test)
+    initial_distance_m = np.sqrt(np.sum(rel_position_m * rel_position_m, axis=1))
+    keep = ~(initial_distance_m > max_initial_distance_m)
+    if stats is not None:
+        stats.pruned_by_distance += int(len(keep) - np.count_nonzero(keep))
+    own, intr, rel_position_m = own[keep], intr[keep], rel_position_m[keep]
+    initial_distance_m = initial_distance_m[keep]
+
+    rel_velocity_mps = np.column_stack(
+        (vx_mps[intr] - vx_mps[own], vy_mps[intr] - vy_mps[own])
+    )
+
+    t_cpa_s, d_cpa_m = compute_cpa_batch(rel_position_m, rel_velocity_mps)
+
+    with np.errstate(invalid="ignore"):
+        in_lookahead = (t_cpa_s > 0.0) & (t_cpa_s <= lookahead_s)
+        keep = in_lookahead & ~(d_cpa_m >= horizontal_sep_m)
+    if stats is not None:
+        n_in_lookahead = int(np.count_nonzero(in_lookahead))
+        n_kept = int(np.count_nonzero(keep))
+        stats.rejected_by_t_cpa += len(keep) - n_in_lookahead
+        stats.rejected_horizontally += n_in_lookahead - n_kept
+    own, intr, t_cpa_s, d_cpa_m = own[keep], intr[keep], t_cpa_s[keep], d_cpa_m[keep]
+    initial_distance_m = initial_distance_m[keep]
+
+    # Vertical separation check (missing altitudes are not rejected,
+    # matching the reference loop)
+    vertical_sep_at_cpa_m = (
+        (altitude_m[intr] - altitude_m[own])
+        + (vertical_rate_mps[intr] - vertical_rate_mps[own]) * t_cpa_s
+    )
+    keep = ~(np.abs(vertical_sep_at_cpa_m) >= vertical_sep_m)
+    if stats is not None:
+        stats.rejected_vertically += int(len(keep) - np.count_nonzero(keep))
+    own, intr = own[keep], intr[keep]
+    t_cpa_s, d_cpa_m = t_cpa_s[keep], d_cpa_m[keep]
+    vertical_sep_at_cpa_m = vertical_sep_at_cpa_m[keep]
+    initial_distance_m = initial_distance_m[keep]
+
+    if stats is not None:
+        stats.conflicts += len(own)
+
+    return {
+        "own": own,
+        "intr": intr,
+        "t_cpa_s": t_cpa_s,
+        "d_cpa_m": d_cpa_m,
+        "vertical_sep_at_cpa_m": vertical_sep_at_cpa_m,
+        "cpa_x_m": x_m[own] + vx_mps[own] * t_cpa_s,
+        "cpa_y_m": y_m[own] + vy_mps[own] * t_cpa_s,
+        "initial_distance_m": initial_distance_m,
+    }
+
+
+def _merge_results(parts: list) -> dict:
+    """
+    Concatenates kernel output from several tiles and sorts the conflicts
+    into itertools.combinations order.
+    """
+    if not parts:
+        return {
+            "own": np.empty(0, dtype=np.intp),
+            "intr": np.empty(0, dtype=np.intp),
+            "t_cpa_s": np.empty(0),
+            "d_cpa_m": np.empty(0),
+            "vertical_sep_at_cpa_m": np.empty(0),
+            "cpa_x_m": np.empty(0),
+            "cpa_y_m": np.empty(0),
+            "initial_distance_m": np.empty(0),
+        }
+
+    merged = {
+        key: np.concatenate([part[key] for part in parts])
+        for key in parts[0]
+    }
+    order = np.lexsort((merged["intr"], merged["own"]))
+    return {key: value[order] for key, value in merged.items()}
+
+
+def _detect_snapshot(
+    x_m: np.ndarray,
+    y_m: np.ndarray,
+    vx_mps: np.ndarray,
+    vy_mps: np.ndarray,
+    altitude_m: np.ndarray,
+    vertical_rate_mps: np.ndarray,
+    lookahead_s: float,
+    sep_nm: float,
+    sep_ft: float,
+    broad_phase: str,
+    altitude_slabs: bool,
+    stats: DetectionStats | None = None,
+    max_tile_pairs: int = DEFAULT_MAX_TILE_PAIRS,
+):
+    """
+    Selects candidate pairs for one projected snapshot and runs the CPA
+    kernel on them, at most ``max_tile_pairs`` pairs at a time.
+
+    Returns:
+        Dictionary of conflict arrays (see :func:`_evaluate_pairs`),
+        sorted into itertools.combinations order
+    """
+    horizontal_sep_m = sep_nm * NM_TO_M
+    vertical_sep_m = sep_ft * FT_TO_M
+
+    max_initial_distance_m = (
+        MAX_RELATIVE_SPEED_MPS * lookahead_s + horizontal_sep_m
+    )
+
+    n = len(x_m)
+    total_pairs = n * (n - 1) // 2
+
+    if altitude_slabs:
+        lower_m, upper_m = altitude_intervals(
+            altitude_m, vertical_rate_mps, lookahead_s
+        )
+
+    # Zero look-ahead and separation leave no grid to bin into
+    if broad_phase == "grid" and max_initial_distance_m > 0:
+        tiles = iter_grid_pairs(x_m, y_m, max_initial_distance_m, max_tile_pairs)
+    elif altitude_slabs:
+        tiles = iter_altitude_band_pairs(lower_m, upper_m, vertical_sep_m, max_tile_pairs)
+    else:
+        tiles = iter_all_pairs(n, max_tile_pairs)
+
+    horizontal_pairs = 0
+    candidate_pairs = 0
+    parts = []
+
+    for own, intr in tiles:
+        if stats is not None:
+            stats.record_tile(len(own))
+
+        horizontal_pairs += len(own)
+        if broad_phase == "grid" and altitude_slabs:
+            keep = altitude_band_mask(own, intr, lower_m, upper_m, vertical_sep_m)
+            own, intr = own[keep], intr[keep]
+        candidate_pairs += len(own)
+
+        parts.append(_evaluate_pairs(
+            own, intr,
+            x_m, y_m, vx_mps, vy_mps, altitude_m, vertical_rate_mps,
+            lookahead_s, horizontal_sep_m, vertical_sep_m,
+            max_initial_distance_m, stats,
+        ))
+
+    if broad_phase != "grid":
+        horizontal_pairs = total_pairs
+
+    if stats is not None:
+        stats.n_aircraft += n
+        stats.total_pairs += total_pairs
+        stats.pruned_by_altitude += horizontal_pairs - candidate_pairs
+        stats.broad_phase_pairs += candidate_pairs
+
+    return _merge_results(parts)
+
+
+def _conflict_frame(icao24: np.ndarray, result: dict) -> pd.DataFrame:
+    """
+    Converts kernel output into the conflict DataFrame returned by
+    :func:`detect_conflicts`, indexed by the (a, b) aircraft pair.
+    """
+    a = icao24[result["own"]]
+    b = icao24[result["intr"]]
+
+    return pd.DataFrame(
+        {
+            "a": a,
+            "b": b,
+            "t_cpa": result["t_cpa_s"],
+            "d_cpa_nm": result["d_cpa_m"] / NM_TO_M,
+            "vert_sep_ft": np.abs(result["vertical_sep_at_cpa_m"]) / FT_TO_M,
+            "cpa_x": result["cpa_x_m"],
+            "cpa_y": result["cpa_y_m"],
+        },
+        index=pd.MultiIndex.from_arrays([a, b]),
+    )
+
+
+def find_conflict(conflict_df: pd.DataFrame, a, b) -> pd.Series | None:
+    """
+    Looks up the conflict between two aircraft in either order.
+
+    Args:
+        conflict_df: Conflicts returned by :func:`detect_conflicts`
+        a: First aircraft ICAO24
+        b: Second aircraft ICAO24
+
+    Returns:
+        The conflict row, or None if the pair is not in conflict
+    """
+    for pair in ((a, b), (b, a)):
+        if pair in conflict_df.index:
+            return conflict_df.iloc[conflict_df.index.get_loc(pair)]
+    return None
+
+
+def rank_conflicts(
+    conflict_df: pd.DataFrame,
+    k: int,
+    by: str = "t_cpa",
+    offset: int = 0,
+) -> pd.DataFrame:
+    """
+    Returns the most severe conflicts without sorting all of them.
+
+    Conflicts are ranked by ascending ``by``, with missing values last;
+    ties keep the order of ``conflict_df``, so the result equals a stable
+    full sort sliced to ``[offset, offset + k)``. Selection is linear in
+    the number of conflicts, and only the selected rows are sorted.
+
+    Args:
+        conflict_df: Conflicts returned by :func:`detect_conflicts`
+        k: Number of conflicts to return
+        by: Severity key, one of SEVERITY_KEYS
+        offset: Number of more severe conflicts to skip, for paging
+
+    Returns:
+        Rows of ``conflict_df`` in rank order
+    """
+    if by not in SEVERITY_KEYS:
+        raise ValueError(f"Unknown severity key: {by!r}")
+
+    values = conflict_df[by].to_numpy(dtype=np.float64)
+    stop = min(offset + k, len(values))
+    if offset >= stop:
+        return conflict_df.iloc[:0]
+
+    # Missing values (e.g. no altitude) rank last, in row order
+    missing = np.isnan(values)
+    finite_rows = np.flatnonzero(~missing)
+    finite = values[finite_rows]
+    n_finite = min(stop, len(finite_rows))
+
+    rows = finite_rows[:0]
+    if n_finite:
+        # Everything strictly below the n-th value, then ties in row order
+        threshold = np.partition(finite, n_finite - 1)[n_finite - 1]
+        below = finite_rows[finite < threshold]
+        ties = finite_rows[finite == threshold][:n_finite - len(below)]
+        rows = np.concatenate((below, ties))
+        rows = rows[np.lexsort((rows, values[rows]))]
+
+    rows = np.concatenate((rows, np.flatnonzero(missing)[:stop - n_finite]))
+    return conflict_df.iloc[rows[offset:stop]]
+
+
 def detect_conflicts(
-    snapshot_df,
+    snapshot,
     lookahead_s: float = DEFAULT_LOOKAHEAD_S,
     sep_nm: float = DEFAULT_HORIZONTAL_SEP_NM,
     sep_ft: float = DEFAULT_VERTICAL_SEP_FT,
+    broad_phase: str = "grid",
+    altitude_slabs: bool = True,
+    stats: DetectionStats | None = None,
+    max_tile_pairs: int = DEFAULT_MAX_TILE_PAIRS,
+    projection: str = "flat",
 ):
     """
     Detects predicted loss of separation events using deterministic
     Closest Point of Approach (CPA) analysis.
 
     Horizontal and vertical separation are evaluated independently.
+    Candidate pairs are evaluated at once with NumPy broadcasting;
+    results match :func:`detect_conflicts_reference`.
+
+    Args:
+        snapshot: ADS-B state snapshot at a single timestamp, as a
+            DataFrame or TrafficSnapshot
+        lookahead_s: Look-ahead horizon [s]
+        sep_nm: Horizontal separation minimum [NM]
+        sep_ft: Vertical separation minimum [ft]
+        broad_phase: Candidate pair selection, "grid" (uniform grid over
+            the local XY plane) or "none" (all pairs)
+        altitude_slabs: Only pair aircraft whose altitude bands reachable
+            within the look-ahead come closer than the vertical minimum
+        stats: Optional DetectionStats filled with pair counters
+        max_tile_pairs: Maximum number of pairs evaluated at once; bounds
+            peak memory (see :func:`tile_pairs_for_memory`)
+        projection: Local XY projection, "flat" (flat-earth) or "enu"
+            (WGS84 East-North tangent plane, for wide regions)
+
+    Returns:
+        DataFrame with one row per conflict, indexed by the (a, b) pair
+        (see :func:`find_conflict`)
+    """
+    if broad_phase not in ("grid", "none"):
+        raise ValueError(f"Unknown broad phase: {broad_phase!r}")
+
+    traffic = _as_traffic(snapshot)
+    x_m, y_m, vx_mps, vy_mps = _project_snapshot(traffic, projection)
+
+    result = _detect_snapshot(
+        x_m, y_m, vx_mps, vy_mps, traffic.altitude_m, traffic.vertical_rate_mps,
+        lookahead_s, sep_nm, sep_ft, broad_phase, altitude_slabs, stats,
+        max_tile_pairs,
+    )
+
+    return _conflict_frame(traffic.icao24, result)
+
+
+def detect_conflicts_over_range(
+    df,
+    t_start: float | None = None,
+    t_end: float | None = None,
+    lookahead_s: float = DEFAULT_LOOKAHEAD_S,
+    sep_nm: float = DEFAULT_HORIZONTAL_SEP_NM,
+    sep_ft: float = DEFAULT_VERTICAL_SEP_FT,
+    broad_phase: str = "grid",
+    altitude_slabs: bool = True,
+    stats: DetectionStats | None = None,
+    max_tile_pairs: int = DEFAULT_MAX_TILE_PAIRS,
+    projection: str = "flat",
+) -> pd.DataFrame:
+    """
+    Detects conflicts in every snapshot between two timestamps.
+
+    States are grouped by time and projected once for the whole range;
+    each snapshot is then evaluated on array slices. Every snapshot uses
+    its own reference point, exactly as :func:`detect_conflicts` does.
+
+    Args:
+        df: ADS-B states for any number of timestamps
+        t_start: First timestamp to analyse (inclusive, None for no bound)
+        t_end: Last timestamp to analyse (inclusive, None for no bound)
+        lookahead_s: Look-ahead horizon [s]
+        sep_nm: Horizontal separation minimum [NM]
+        sep_ft: Vertical separation minimum [ft]
+        broad_phase: Candidate pair selection, "grid" or "none"
+        altitude_slabs: Enable the altitude-slab vertical pre-filter
+        stats: Optional DetectionStats accumulated over all snapshots
+        max_tile_pairs: Maximum number of pairs evaluated at once
+        projection: Local XY projection, "flat" or "enu"
+
+    Returns:
+        DataFrame of conflicts with a leading ``time`` column, ordered by
+        time and then as :func:`detect_conflicts` orders each snapshot
+    """
+    if broad_phase not in ("grid", "none"):
+        raise ValueError(f"Unknown broad phase: {broad_phase!r}")
+
+    time = df["time"].to_numpy()
+    in_range = np.ones(len(time), dtype=bool)
+    if t_start is not None:
+        in_range &= time >= t_start
+    if t_end is not None:
+        in_range &= time <= t_end
+
+    rows = np.flatnonzero(in_range)
+    rows = rows[np.argsort(time[rows], kind="stable")]
+    time = time[rows]
+
+    _, starts = np.unique(time, return_index=True)
+    ends = np.append(starts[1:], len(rows))
+
+    traffic = TrafficSnapshot.from_frame(df).take(rows)
+
+    # Per-snapshot reference point (NaN-skipping mean, as pandas does)
+    lat_ref = _nanmean_per_group(traffic.lat_deg, starts)
+    lon_ref = _nanmean_per_group(traffic.lon_deg, starts)
+    group_sizes = ends - starts
+    local = LocalProjection(
+        np.repeat(lat_ref, group_sizes),
+        np.repeat(lon_ref, group_sizes),
+        projection,
+    )
+    x_m, y_m = traffic.position_xy(local)
+    vx_mps, vy_mps = traffic.velocity_xy(local)
+    altitude_m = traffic.altitude_m
+    vertical_rate_mps = traffic.vertical_rate_mps
+
+    own_parts, intr_parts, results = [], [], []
+    for start, end in zip(starts, ends):
+        window = slice(start, end)
+        result = _detect_snapshot(
+            x_m[window], y_m[window], vx_mps[window], vy_mps[window],
+            altitude_m[window], vertical_rate_mps[window],
+            lookahead_s, sep_nm, sep_ft, broad_phase, altitude_slabs, stats,
+            max_tile_pairs,
+        )
+        own_parts.append(start + result["own"])
+        intr_parts.append(start + result["intr"])
+        results.append(result)
+
+    def gather(parts, dtype=float):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+
+    own = gather(own_parts, np.intp)
+    intr = gather(intr_parts, np.intp)
+
+    return pd.DataFrame({
+        "time": time[own],
+        "a": traffic.icao24[own],
+        "b": traffic.icao24[intr],
+        "t_cpa": gather([r["t_cpa_s"] for r in results]),
+        "d_cpa_nm": gather([r["d_cpa_m"] for r in results]) / NM_TO_M,
+        "vert_sep_ft": np.abs(gather([r["vertical_sep_at_cpa_m"] for r in results])) / FT_TO_M,
+        "cpa_x": gather([r["cpa_x_m"] for r in results]),
+        "cpa_y": gather([r["cpa_y_m"] for r in results]),
+    })
+
+
+def _nanmean_per_group(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    NaN-skipping mean of consecutive groups starting at ``starts``.
+    """
+    if len(starts) == 0:
+        return np.empty(0)
+    finite = np.isfinite(values)
+    sums = np.add.reduceat(np.where(finite, values, 0.0), starts)
+    counts = np.add.reduceat(finite.astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def sweep_conflicts(
+    snapshot,
+    lookahead_values,
+    sep_nm_values,
+    sep_ft_values,
+    return_conflicts: bool = False,
+    broad_phase: str = "grid",
+    altitude_slabs: bool = True,
+    stats: DetectionStats | None = None,
+    max_tile_pairs: int = DEFAULT_MAX_TILE_PAIRS,
+    projection: str = "flat",
+):
+    """
+    Runs conflict detection for every combination of separation
+    parameters while computing the pair geometry only once.
+
+    The snapshot is evaluated for the loosest parameters in the grid.
+    Each combination is then a threshold mask over those conflicts, so
+    every combination gives the same conflicts as :func:`detect_conflicts`.
+
+    Args:
+        snapshot: ADS-B state snapshot at a single timestamp, as a
+            DataFrame or TrafficSnapshot
+        lookahead_values: Look-ahead horizons to test [s]
+        sep_nm_values: Horizontal separation minima to test [NM]
+        sep_ft_values: Vertical separation minima to test [ft]
+        return_conflicts: Also return the conflicts of every combination
+        broad_phase: Candidate pair selection, "grid" or "none"
+        altitude_slabs: Enable the altitude-slab vertical pre-filter
+        stats: Optional DetectionStats for the single loosest evaluation
+        max_tile_pairs: Maximum number of pairs evaluated at once
+        projection: Local XY projection, "flat" or "enu"
+
+    Returns:
+        DataFrame with one row per (lookahead_s, sep_nm, sep_ft) and its
+        conflict count. If return_conflicts is set, a tuple of that
+        DataFrame and a dict mapping each combination to its conflict
+        DataFrame.
+    """
+    if broad_phase not in ("grid", "none"):
+        raise ValueError(f"Unknown broad phase: {broad_phase!r}")
+
+    lookahead_values = np.asarray(lookahead_values, dtype=float)
+    sep_nm_values = np.asarray(sep_nm_values, dtype=float)
+    sep_ft_values = np.asarray(sep_ft_values, dtype=float)
+
+    traffic = _as_traffic(snapshot)
+    x_m, y_m, vx_mps, vy_mps = _project_snapshot(traffic, projection)
+
+    result = _detect_snapshot(
+        x_m, y_m, vx_mps, vy_mps, traffic.altitude_m, traffic.vertical_rate_mps,
+        lookahead_values.max(), sep_nm_values.max(), sep_ft_values.max(),
+        broad_phase, altitude_slabs, stats, max_tile_pairs,
+    )
+
+    horizontal_sep_m = sep_nm_values * NM_TO_M
+    vertical_sep_m = sep_ft_values * FT_TO_M
+    max_initial_distance_m = (
+        MAX_RELATIVE_SPEED_MPS * lookahead_values[:, None]
+        + horizontal_sep_m[None, :]
+    )
+
+    # Per-conflict masks: (M, lookahead), (M, lookahead, sep_nm), (M, sep_ft)
+    within_lookahead = result["t_cpa_s"][:, None] <= lookahead_values
+    within_horizontal = (
+        (result["d_cpa_m"][:, None, None] < horizontal_sep_m[None, None, :])
+        & (result["initial_distance_m"][:, None, None] <= max_initial_distance_m)
+    )
+    within_vertical = ~(
+        np.abs(result["vertical_sep_at_cpa_m"])[:, None] >= vertical_sep_m
+    )
+
+    counts = np.einsum(
+        "ml,mlh,mv->lhv",
+        within_lookahead.astype(np.int64),
+        within_horizontal.astype(np.int64),
+        within_vertical.astype(np.int64),
+    )
+
+    lookahead_grid, sep_nm_grid, sep_ft_grid = np.meshgrid(
+        lookahead_values, sep_nm_values, sep_ft_values, indexing="ij"
+    )
+    counts_df = pd.DataFrame({
+        "lookahead_s": lookahead_grid.ravel(),
+        "sep_nm": sep_nm_grid.ravel(),
+        "sep_ft": sep_ft_grid.ravel(),
+        "conflicts": counts.ravel(),
+    })
+
+    if not return_conflicts:
+        return counts_df
+
+    conflicts = {}
+    for li, lookahead_s in enumerate(lookahead_values.tolist()):
+        for hi, sep_nm in enumerate(sep_nm_values.tolist()):
+            for vi, sep_ft in enumerate(sep_ft_values.tolist()):
+                keep = within_lookahead[:, li] & within_horizontal[:, li, hi] & within_vertical[:, vi]
+                conflicts[(lookahead_s, sep_nm, sep_ft)] = _conflict_frame(
+                    traffic.icao24, {key: value[keep] for key, value in result.items()}
+                )
+
+    return counts_df, conflicts
+
+
+def detect_conflicts_reference(
+    snapshot_df,
+    lookahead_s: float = DEFAULT_LOOKAHEAD_S,
+    sep_nm: float = DEFAULT_HORIZONTAL_SEP_NM,
+    sep_ft: float = DEFAULT_VERTICAL_SEP_FT,
+):
+    """
+    Reference implementation of :func:`detect_conflicts`.
+
+    Evaluates every aircraft pair in a Python loop. Kept to validate
+    the vectorized engine; not intended for use on large snapshots.
 
     Args:
         snapshot_df: ADS-B state snapshot at a single timestamp
@@ -160,3 +828,170 @@ def detect_conflicts(
         })
 
     return conflicts
+
+
+class VerletConflictDetector:
+    """
+    Stateful conflict detector for consecutive snapshots.
+
+    Keeps a Verlet neighbour list: all pairs within the pre-filter
+    distance plus twice a skin margin. While no aircraft has moved more
+    than the skin since the list was built, only the cached pairs are
+    re-evaluated; otherwise the list is rebuilt with the grid broad phase.
+    Results are identical to :func:`detect_conflicts` with the default
+    flat projection.
+    """
+
+    def __init__(self, skin_m: float = DEFAULT_NEIGHBOUR_SKIN_M):
+        self.skin_m = skin_m
+        self.rebuilds = 0
+        self._icao_index = None
+
+    def reset(self):
+        """Drop the cached neighbour list."""
+        self._icao_index = None
+
+    def detect(
+        self,
+        snapshot,
+        lookahead_s: float = DEFAULT_LOOKAHEAD_S,
+        sep_nm: float = DEFAULT_HORIZONTAL_SEP_NM,
+        sep_ft: float = DEFAULT_VERTICAL_SEP_FT,
+        altitude_slabs: bool = True,
+        stats: DetectionStats | None = None,
+        max_tile_pairs: int = DEFAULT_MAX_TILE_PAIRS,
+    ):
+        """
+        Detects conflicts in the next snapshot.
+
+        Args:
+            snapshot: ADS-B state snapshot at a single timestamp, as a
+                DataFrame or TrafficSnapshot
+            lookahead_s: Look-ahead horizon [s]
+            sep_nm: Horizontal separation minimum [NM]
+            sep_ft: Vertical separation minimum [ft]
+            altitude_slabs: Enable the altitude-slab vertical pre-filter
+            stats: Optional DetectionStats filled with pair counters
+            max_tile_pairs: Maximum number of pairs evaluated at once
+
+        Returns:
+            DataFrame of conflicts, as returned by :func:`detect_conflicts`
+        """
+        horizontal_sep_m = sep_nm * NM_TO_M
+        vertical_sep_m = sep_ft * FT_TO_M
+
+        max_initial_distance_m = (
+            MAX_RELATIVE_SPEED_MPS * lookahead_s + horizontal_sep_m
+        )
+
+        traffic = _as_traffic(snapshot)
+        projection = traffic.projection()
+        x_m, y_m, vx_mps, vy_mps = _project_snapshot(traffic)
+        altitude_m = traffic.altitude_m
+        vertical_rate_mps = traffic.vertical_rate_mps
+        n = len(traffic)
+
+        rows = self._cached_rows(traffic, x_m, y_m, projection, max_initial_distance_m)
+        if rows is None:
+            self._rebuild(traffic, x_m, y_m, projection, max_initial_distance_m, max_tile_pairs)
+            rows = np.arange(n)
+
+        row_of_cached = np.full(len(self._icao_index), -1, dtype=np.intp)
+        row_of_cached[rows] = np.arange(n)
+
+        if altitude_slabs:
+            lower_m, upper_m = altitude_intervals(
+                altitude_m, vertical_rate_mps, lookahead_s
+            )
+
+        horizontal_pairs = 0
+        candidate_pairs = 0
+        parts = []
+
+        for first in range(0, len(self._own), max_tile_pairs):
+            tile = slice(first, first + max_tile_pairs)
+            if stats is not None:
+                stats.record_tile(len(self._own[tile]))
+
+            # Map cached pairs onto current rows
+            a = row_of_cached[self._own[tile]]
+            b = row_of_cached[self._intr[tile]]
+            present = (a >= 0) & (b >= 0)
+            own = np.minimum(a[present], b[present])
+            intr = np.maximum(a[present], b[present])
+
+            horizontal_pairs += len(own)
+            if altitude_slabs:
+                keep = altitude_band_mask(own, intr, lower_m, upper_m, vertical_sep_m)
+                own, intr = own[keep], intr[keep]
+            candidate_pairs += len(own)
+
+            parts.append(_evaluate_pairs(
+                own, intr,
+                x_m, y_m, vx_mps, vy_mps, altitude_m, vertical_rate_mps,
+                lookahead_s, horizontal_sep_m, vertical_sep_m,
+                max_initial_distance_m, stats,
+            ))
+
+        if stats is not None:
+            stats.n_aircraft += n
+            stats.total_pairs += n * (n - 1) // 2
+            stats.pruned_by_altitude += horizontal_pairs - candidate_pairs
+            stats.broad_phase_pairs += candidate_pairs
+
+        return _conflict_frame(traffic.icao24, _merge_results(parts))
+
+    def _cached_rows(self, traffic, x_m, y_m, projection, max_initial_distance_m):
+        """
+        Maps the snapshot onto the cached list.
+
+        Returns:
+            Cached index of every snapshot row, or None if the list
+            must be rebuilt
+        """
+        if self._icao_index is None or not self._icao_index.is_unique:
+            return None
+
+        rows = self._icao_index.get_indexer(traffic.icao24)
+        if (rows < 0).any() or len(np.unique(rows)) != len(rows):
+            return None
+
+        # Displacement since the build, measured in the current frame
+        built_x_m, built_y_m = projection.to_xy(self._lat[rows], self._lon[rows])
+        located = np.isfinite(x_m) & np.isfinite(y_m)
+        if not np.isfinite(built_x_m[located] + built_y_m[located]).all():
+            return None
+
+        displacement_m = np.hypot(x_m - built_x_m, y_m - built_y_m)[located]
+        max_displacement_m = displacement_m.max(initial=0.0)
+
+        # A change of reference latitude rescales x distances
+        scale = np.cos(np.radians(projection.lat0)) / np.cos(np.radians(self._lat_ref))
+        margin_m = self._list_radius_m * min(1.0, scale) - max_initial_distance_m
+
+        if not 2.0 * max_displacement_m <= margin_m:
+            return None
+        return rows
+
+    def _rebuild(self, traffic, x_m, y_m, projection, max_initial_distance_m, max_tile_pairs):
+        """Builds the neighbour list from the current snapshot."""
+        self._list_radius_m = max_initial_distance_m + 2.0 * self.skin_m
+
+        own_parts, intr_parts = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+        if self._list_radius_m > 0:
+            tiles = iter_grid_pairs(x_m, y_m, self._list_radius_m, max_tile_pairs)
+        else:
+            tiles = iter_all_pairs(len(x_m), max_tile_pairs)
+        for own, intr in tiles:
+            distance_m = np.hypot(x_m[intr] - x_m[own], y_m[intr] - y_m[own])
+            keep = distance_m <= self._list_radius_m
+            own_parts.append(own[keep])
+            intr_parts.append(intr[keep])
+
+        self._own = np.concatenate(own_parts)
+        self._intr = np.concatenate(intr_parts)
+        self._icao_index = pd.Index(traffic.icao24)
+        self._lat = traffic.lat_deg
+        self._lon = traffic.lon_deg
+        self._lat_ref = projection.lat0
+        self.rebuilds += 1
@@ -0,0 +1,120 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+
+@dataclass(slots=True)
+class ConflictEpisode:
+    """
+    One encounter between two aircraft, spanning consecutive snapshots
+    in which the pair was in conflict.
+    """
+    a: str
+    b: str
+    start_time: float
+    end_time: float
+    min_d_cpa_nm: float
+    min_vert_sep_ft: float
+    first_alert_lead_s: float
+    snapshots: int = 1
+
+
+class ConflictEpisodeTracker:
+    """
+    Incrementally groups per-snapshot conflicts into episodes.
+
+    Snapshots must be fed in time order, including those without
+    conflicts. An episode stays open while its pair is in conflict and
+    is closed at the first snapshot where it is not. Each update costs
+    O(conflicts) in the current and previous snapshot; history is never
+    rescanned.
+    """
+
+    def __init__(self):
+        self._open = {}
+        self._last_time = None
+
+    def reset(self):
+        """Drops all open episodes."""
+        self._open = {}
+        self._last_time = None
+
+    @property
+    def open_episodes(self) -> list:
+        """Episodes still in progress."""
+        return list(self._open.values())
+
+    def update(self, time: float, conflict_df: pd.DataFrame) -> list:
+        """
+        Consumes the conflicts of the next snapshot.
+
+        Args:
+            time: Snapshot timestamp, later than the previous one
+            conflict_df: Conflicts returned by detect_conflicts for that
+                snapshot
+
+        Returns:
+            List of ConflictEpisode closed by this snapshot
+        """
+        if self._last_time is not None and time <= self._last_time:
+            raise ValueError(
+                f"Snapshots must have increasing times: {time} <= {self._last_time}"
+            )
+        self._last_time = time
+
+        still_open = {}
+        for a, b, t_cpa, d_cpa_nm, vert_sep_ft in zip(
+            conflict_df["a"].tolist(),
+            conflict_df["b"].tolist(),
+            conflict_df["t_cpa"].tolist(),
+            conflict_df["d_cpa_nm"].tolist(),
+            conflict_df["vert_sep_ft"].tolist(),
+        ):
+            # Row order may flip a pair between snapshots
+            key = (a, b) if a <= b else (b, a)
+            episode = self._open.pop(key, None)
+
+            if episode is None:
+                episode = ConflictEpisode(
+                    key[0], key[1], time, time, d_cpa_nm, vert_sep_ft, t_cpa
+                )
+            else:
+                episode.end_time = time
+                episode.min_d_cpa_nm = min(episode.min_d_cpa_nm, d_cpa_nm)
+                episode.min_vert_sep_ft = float(np.fmin(episode.min_vert_sep_ft, vert_sep_ft))
+                episode.snapshots += 1
+
+            still_open[key] = episode
+
+        closed = list(self._open.values())
+        self._open = still_open
+        return closed
+
+    def flush(self) -> list:
+        """
+        Closes every open episode, e.g. at the end of the analysed range.
+
+        Returns:
+            List of ConflictEpisode that were still open
+        """
+        closed = self.open_episodes
+        self.reset()
+        return closed
+
+
+def episodes_to_frame(episodes: list) -> pd.DataFrame:
+    """
+    Converts episodes into a DataFrame with one row per episode.
+
+    Args:
+        episodes: List of ConflictEpisode
+
+    Returns:
+        DataFrame sorted by start time
+    """
+    columns = list(ConflictEpisode.__dataclass_fields__)
+    df = pd.DataFrame(
+        [[getattr(episode, name) for name in columns] for episode in episodes],
+        columns=columns,
+    )
+    return df.sort_values(["start_time", "a", "b"], kind="stable", ignore_index=True)
@@ -1,5 +1,6 @@
+from dataclasses import dataclass
 import numpy as np
-from src.constants import EARTH_RADIUS_M
+from src.constants import EARTH_RADIUS_M, WGS84_A_M, WGS84_F
 
 
 def latlon_to_xy(lat: float, lon: float, lat0: float, lon0: float) -> np.ndarray:
@@ -39,3 +40,193 @@ def xy_to_lonlat(x: float, y: float, lat0: float, lon0: float) -> tuple:
     lon = lon0 + (x / (EARTH_RADIUS_M * np.cos(np.radians(lat0)))) * 180 / np.pi
     lat = lat0 + (y / EARTH_RADIUS_M) * 180 / np.pi
     return lon, lat
+
+
+@dataclass
+class LocalProjection:
+    """
+    Projection of whole lat/lon columns onto a local XY plane around
+    a reference point.
+
+    Reference trigonometry is evaluated once at construction, so a
+    snapshot pays for it once instead of once per aircraft.
+
+    Modes:
+        flat: Equirectangular (flat-earth) approximation on a sphere,
+            identical to :func:`latlon_to_xy`
+        enu: Local East-North-Up tangent plane on the WGS84 ellipsoid;
+            more accurate over wide regions
+    """
+    lat0: float
+    lon0: float
+    mode: str = "flat"
+
+    def __post_init__(self):
+        if self.mode not in ("flat", "enu"):
+            raise ValueError(f"Unknown projection mode: {self.mode!r}")
+
+        self._lat0_rad = np.radians(self.lat0)
+        self._lon0_rad = np.radians(self.lon0)
+        self._sin_lat0 = np.sin(self._lat0_rad)
+        self._cos_lat0 = np.cos(self._lat0_rad)
+        self._sin_lon0 = np.sin(self._lon0_rad)
+        self._cos_lon0 = np.cos(self._lon0_rad)
+
+        if self.mode == "enu":
+            self._origin_ecef_m = _geodetic_to_ecef(self._lat0_rad, self._lon0_rad)
+
+    def to_xy(self, lat, lon):
+        """
+        Convert lat/lon arrays to XY coordinates.
+
+        Args:
+            lat: Latitudes [deg]
+            lon: Longitudes [deg]
+
+        Returns:
+            Tuple of (x, y) arrays in meters
+        """
+        lat_rad = np.radians(lat)
+        lon_rad = np.radians(lon)
+
+        if self.mode == "flat":
+            x = (lon_rad - self._lon0_rad) * self._cos_lat0 * EARTH_RADIUS_M
+            y = (lat_rad - self._lat0_rad) * EARTH_RADIUS_M
+            return x, y
+
+        ox, oy, oz = self._origin_ecef_m
+        px, py, pz = _geodetic_to_ecef(lat_rad, lon_rad)
+        dx, dy, dz = px - ox, py - oy, pz - oz
+
+        east = -self._sin_lon0 * dx + self._cos_lon0 * dy
+        north = (
+            -self._sin_lat0 * self._cos_lon0 * dx
+            - self._sin_lat0 * self._sin_lon0 * dy
+            + self._cos_lat0 * dz
+        )
+        return east, north
+
+    def velocity_to_xy(self, lat, lon, v_east, v_north):
+        """
+        Convert velocities in each aircraft's own east/north frame to the
+        XY frame of the projection.
+
+        In flat mode the frames coincide. In enu mode every velocity is
+        rotated from the local tangent plane at its position into the
+        reference tangent plane via ECEF.
+
+        Args:
+            lat: Latitudes of the aircraft [deg]
+            lon: Longitudes of the aircraft [deg]
+            v_east: East components [m/s]
+            v_north: North components [m/s]
+
+        Returns:
+            Tuple of (vx, vy) arrays in m/s
+        """
+        if self.mode == "flat":
+            return v_east, v_north
+
+        lat_rad = np.radians(lat)
+        lon_rad = np.radians(lon)
+        sin_lat, cos_lat = np.sin(lat_rad), np.cos(lat_rad)
+        sin_lon, cos_lon = np.sin(lon_rad), np.cos(lon_rad)
+
+        # ECEF velocity from the local east and north unit vectors
+        dx = -sin_lon * v_east - sin_lat * cos_lon * v_north
+        dy = cos_lon * v_east - sin_lat * sin_lon * v_north
+        dz = cos_lat * v_north
+
+        vx = -self._sin_lon0 * dx + self._cos_lon0 * dy
+        vy = (
+            -self._sin_lat0 * self._cos_lon0 * dx
+            - self._sin_lat0 * self._sin_lon0 * dy
+            + self._cos_lat0 * dz
+        )
+        return vx, vy
+
+    def to_lonlat(self, x, y):
+        """
+        Convert XY coordinate arrays back to lon/lat.
+
+        Args:
+            x: X coordinates in meters
+            y: Y coordinates in meters
+
+        Returns:
+            Tuple of (longitude, latitude) arrays [deg]
+        """
+        if self.mode == "flat":
+            lon = self.lon0 + np.degrees(x / (EARTH_RADIUS_M * self._cos_lat0))
+            lat = self.lat0 + np.degrees(y / EARTH_RADIUS_M)
+            return lon, lat
+
+        # Drop the point along the reference up axis until it reaches
+        # the ellipsoid surface
+        ox, oy, oz = self._origin_ecef_m
+        up = np.zeros_like(np.asarray(x, dtype=float))
+        for _ in range(_ENU_INVERSE_ITERATIONS):
+            px = ox + (
+                -self._sin_lon0 * x
+                - self._sin_lat0 * self._cos_lon0 * y
+                + self._cos_lat0 * self._cos_lon0 * up
+            )
+            py = oy + (
+                self._cos_lon0 * x
+                - self._sin_lat0 * self._sin_lon0 * y
+                + self._cos_lat0 * self._sin_lon0 * up
+            )
+            pz = oz + self._cos_lat0 * y + self._sin_lat0 * up
+            lat_rad, lon_rad, height_m = _ecef_to_geodetic(px, py, pz)
+            up = up - height_m
+
+        return np.degrees(lon_rad), np.degrees(lat_rad)
+
+
+_ENU_INVERSE_ITERATIONS = 4
+
+_WGS84_B_M = WGS84_A_M * (1.0 - WGS84_F)
+_WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+_WGS84_EP2 = _WGS84_E2 / (1.0 - _WGS84_E2)
+
+
+def _geodetic_to_ecef(lat_rad, lon_rad):
+    """
+    Convert geodetic coordinates on the WGS84 ellipsoid surface to ECEF.
+
+    Returns:
+        Tuple of (x, y, z) in meters
+    """
+    sin_lat = np.sin(lat_rad)
+    cos_lat = np.cos(lat_rad)
+    n = WGS84_A_M / np.sqrt(1.0 - _WGS84_E2 * sin_lat * sin_lat)
+    return (
+        n * cos_lat * np.cos(lon_rad),
+        n * cos_lat * np.sin(lon_rad),
+        n * (1.0 - _WGS84_E2) * sin_lat,
+    )
+
+
+def _ecef_to_geodetic(x, y, z):
+    """
+    Convert ECEF coordinates to WGS84 geodetic (Bowring's method).
+
+    Returns:
+        Tuple of (lat_rad, lon_rad, height_m)
+    """
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * WGS84_A_M, p * _WGS84_B_M)
+    sin_theta = np.sin(theta)
+    cos_theta = np.cos(theta)
+
+    lat_rad = np.arctan2(
+        z + _WGS84_EP2 * _WGS84_B_M * sin_theta ** 3,
+        p - _WGS84_E2 * WGS84_A_M * cos_theta ** 3,
+    )
+    lon_rad = np.arctan2(y, x)
+
+    sin_lat = np.sin(lat_rad)
+    n = WGS84_A_M / np.sqrt(1.0 - _WGS84_E2 * sin_lat * sin_lat)
+    height_m = p / np.cos(lat_rad) - n
+
+    return lat_rad, lon_rad, height_m
@@ -0,0 +1,72 @@
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+
+logger = logging.getLogger("aircpa.pipeline")
+
+
+@dataclass
+class PipelineTrace:
+    """
+    Wall-time spans and counters collected during one pipeline run.
+    """
+    spans: list = field(default_factory=list)
+    counters: dict = field(default_factory=dict)
+
+    @contextmanager
+    def span(self, stage: str):
+        """Records the wall time of the enclosed block as ``stage``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((stage, time.perf_counter() - started))
+
+    def record_stats(self, stats):
+        """
+        Adds detector counters from a DetectionStats.
+
+        Args:
+            stats: DetectionStats filled by a detection call
+        """
+        self.counters.update(asdict(stats))
+        self.counters["pruned_by_broad_phase"] = stats.pruned_by_broad_phase
+
+    @property
+    def total_s(self) -> float:
+        return sum(seconds for _, seconds in self.spans)
+
+    def to_records(self) -> list:
+        """
+        Returns:
+            List of {"stage", "duration_ms"} dictionaries in run order
+        """
+        return [
+            {"stage": stage, "duration_ms": seconds * 1e3}
+            for stage, seconds in self.spans
+        ]
+
+    def log(self, level: int = logging.INFO):
+        """
+        Emits one log record per span and one with the counters. The
+        values are attached as record attributes for structured handlers.
+        """
+        for record in self.to_records():
+            logger.log(
+                level, "stage %s took %.1f ms", record["stage"], record["duration_ms"],
+                extra=record,
+            )
+        if self.counters:
+            logger.log(
+                level, "detector counters %s", self.counters,
+                extra={"counters": dict(self.counters)},
+            )
+
+
+def span(trace: PipelineTrace | None, stage: str):
+    """
+    Span context for an optional trace; does nothing when ``trace`` is None.
+    """
+    return trace.span(stage) if trace is not None else nullcontext()
@@ -0,0 +1,440 @@
+"""
+Asyncio replay of recorded traffic as a live feed.
+
+State vectors are consumed one message at a time into a bounded table of
+the latest state per aircraft, and conflicts are detected on a fixed
+wall-clock cadence and pushed to subscribers:
+
+    python -m src.replay data/synthetic_opensky_germany --speed 10 --cadence 1
+
+A local socket can stand in for a receiver. One process serves the
+recording as JSON lines, and another consumes it:
+
+    python -m src.replay data/synthetic_opensky_germany --serve 127.0.0.1:30003
+    python -m src.replay --connect 127.0.0.1:30003
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src.constants import (
+    DEFAULT_HORIZONTAL_SEP_NM,
+    DEFAULT_LOOKAHEAD_S,
+    DEFAULT_REPLAY_CAPACITY,
+    DEFAULT_STATE_MAX_AGE_S,
+    DEFAULT_VERTICAL_SEP_FT,
+)
+from src.data.dataset import load_traffic
+from src.domain.aircraft import TrafficSnapshot
+from src.domain.alignment import extrapolate_positions
+from src.domain.cpa import VerletConflictDetector
+
+
+# Message fields kept per aircraft, in TrafficSnapshot order
+STATE_FIELDS = ("lat", "lon", "velocity", "heading", "baroaltitude", "vertrate")
+
+
+class LatestStateTable:
+    """
+    Latest state vector per aircraft in fixed-size arrays.
+
+    At most ``capacity`` aircraft are kept; when the table is full the
+    aircraft with the oldest position is evicted. Snapshots extrapolate
+    every position to the current feed time and drop positions older
+    than ``max_age_s``, like :func:`src.domain.alignment.align_states`
+    but with the replay's own, longer cutoff by default.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_REPLAY_CAPACITY,
+        max_age_s: float = DEFAULT_STATE_MAX_AGE_S,
+    ):
+        self.capacity = capacity
+        self.max_age_s = max_age_s
+        self._slots = {}
+        self._free = list(range(capacity - 1, -1, -1))
+        self._icao24 = np.empty(capacity, dtype=object)
+        self._values = np.full((capacity, len(STATE_FIELDS)), np.nan)
+        self._time = np.full(capacity, -np.inf)
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def update(self, message: dict) -> bool:
+        """
+        Stores a state vector unless a newer one is already held.
+
+        Args:
+            message: State vector with icao24, time and STATE_FIELDS keys,
+                and optionally lastposupdate
+
+        Returns:
+            True if the message was stored
+        """
+        icao = message["icao24"]
+        position_time = message.get("lastposupdate")
+        if position_time is None or math.isnan(position_time):
+            position_time = message["time"]
+        slot = self._slots.get(icao)
+
+        if slot is None:
+            if not self._free:
+                self._evict(int(np.argmin(self._time)))
+                self.evictions += 1
+            slot = self._free.pop()
+            self._slots[icao] = slot
+            self._icao24[slot] = icao
+        elif position_time < self._time[slot]:
+            return False
+
+        self._time[slot] = position_time
+        self._values[slot] = [
+            np.nan if message.get(name) is None else message[name]
+            for name in STATE_FIELDS
+        ]
+        return True
+
+    def _evict(self, slot: int):
+        del self._slots[self._icao24[slot]]
+        self._icao24[slot] = None
+        self._time[slot] = -np.inf
+        self._free.append(slot)
+
+    def snapshot(self, now: float) -> TrafficSnapshot:
+        """
+        Copies the current states, aligned to ``now``, into a TrafficSnapshot.
+
+        Args:
+            now: Current feed time; positions older than max_age_s are dropped
+
+        Returns:
+            TrafficSnapshot of the aircraft still in the table
+        """
+        for slot in np.flatnonzero(
+            np.isfinite(self._time) & (self._time < now - self.max_age_s)
+        ):
+            self._evict(int(slot))
+
+        rows = np.fromiter(self._slots.values(), dtype=np.intp, count=len(self._slots))
+        lat, lon, velocity, heading, altitude, vertrate = self._values[rows].T
+        lat, lon, altitude = extrapolate_positions(
+            lat, lon, altitude, velocity, heading, vertrate, now - self._time[rows]
+        )
+
+        return TrafficSnapshot(
+            icao24=self._icao24[rows],
+            lat_deg=lat,
+            lon_deg=lon,
+            velocity_mps=velocity,
+            heading_deg=heading,
+            altitude_m=altitude,
+            vertical_rate_mps=vertrate,
+        )
+
+
+@dataclass
+class ConflictUpdate:
+    """Conflicts published after one detection cycle."""
+    feed_time: float
+    conflicts: pd.DataFrame
+    aircraft: int
+    latency_s: float
+
+
+@dataclass
+class ReplayStats:
+    """Throughput and latency counters of a replay run."""
+    messages: int = 0
+    cycles: int = 0
+    detect_s: float = 0.0
+    max_latency_s: float = 0.0
+    total_latency_s: float = 0.0
+    elapsed_s: float = 0.0
+
+    @property
+    def message_rate(self) -> float:
+        return self.messages / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def mean_latency_s(self) -> float:
+        return self.total_latency_s / self.cycles if self.cycles else 0.0
+
+
+class FileReplay:
+    """
+    Async source that replays a recorded dataset in feed-time order.
+
+    Messages of each timestamp are released when the scaled wall clock
+    reaches it. ``max_lag_s`` records how far the consumer fell behind
+    that schedule; if it keeps growing, the message rate is not
+    sustainable.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: float = 1.0,
+        t_start: float | None = None,
+        t_end: float | None = None,
+    ):
+        self.path = path
+        self.speed = speed
+        self.t_start = t_start
+        self.t_end = t_end
+        self.max_lag_s = 0.0
+
+    async def __aiter__(self):
+        states = load_traffic(self.path, t_start=self.t_start, t_end=self.t_end)
+        states = states.sort_values("time", kind="stable")
+        columns = ["time", "icao24", *STATE_FIELDS, "lastposupdate"]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first_time = None
+
+        for feed_time, group in states[columns].groupby("time", sort=False):
+            if first_time is None:
+                first_time = feed_time
+
+            if math.isfinite(self.speed):
+                due = started + (feed_time - first_time) / self.speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    self.max_lag_s = max(self.max_lag_s, -delay)
+
+            for message in group.to_dict("records"):
+                yield message
+            # Let consumers run between timestamps even when unthrottled
+            await asyncio.sleep(0)
+
+
+async def read_socket(host: str, port: int):
+    """
+    Async source reading JSON-line state vectors from a TCP socket.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while line := await reader.readline():
+            yield json.loads(line)
+    finally:
+        writer.close()
+
+
+async def start_replay_server(make_source, host: str, port: int) -> asyncio.Server:
+    """
+    Starts a TCP server standing in for a receiver. Every client gets the
+    full feed as JSON lines from its own source.
+
+    Args:
+        make_source: Callable returning a new async iterable of messages
+        host: Interface to bind
+        port: Port to bind, 0 for any free port
+
+    Returns:
+        The started asyncio.Server
+    """
+    async def handle(reader, writer):
+        try:
+            async for message in make_source():
+                writer.write(json.dumps(message, default=_json_default).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+
+class ReplayPipeline:
+    """
+    Consumes a message source into a LatestStateTable and detects
+    conflicts every ``cadence_s`` seconds of wall time.
+
+    Detection runs in a worker thread on a copy of the table, so
+    ingestion continues meanwhile. Latency is measured from the receipt
+    of the oldest message not yet covered by a detection to the
+    publication of its conflicts.
+    """
+
+    def __init__(
+        self,
+        cadence_s: float = 1.0,
+        lookahead_s: float = DEFAULT_LOOKAHEAD_S,
+        sep_nm: float = DEFAULT_HORIZONTAL_SEP_NM,
+        sep_ft: float = DEFAULT_VERTICAL_SEP_FT,
+        table: LatestStateTable | None = None,
+    ):
+        self.cadence_s = cadence_s
+        self.lookahead_s = lookahead_s
+        self.sep_nm = sep_nm
+        self.sep_ft = sep_ft
+        self.table = table if table is not None else LatestStateTable()
+        self.detector = VerletConflictDetector()
+        self.stats = ReplayStats()
+        self._subscribers = []
+        self._feed_time = -np.inf
+        self._oldest_pending = None
+
+    def subscribe(self, maxsize: int = 100) -> asyncio.Queue:
+        """
+        Returns a queue receiving a ConflictUpdate after every cycle. Slow
+        consumers lose their oldest updates rather than stalling the feed.
+        """
+        queue = asyncio.Queue(maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    async def _ingest(self, source):
+        loop = asyncio.get_running_loop()
+        async for message in source:
+            self.table.update(message)
+            self._feed_time = max(self._feed_time, message["time"])
+            if self._oldest_pending is None:
+                self._oldest_pending = loop.time()
+            self.stats.messages += 1
+
+    async def _detect_once(self):
+        loop = asyncio.get_running_loop()
+        pending = self._oldest_pending
+        self._oldest_pending = None
+        traffic = self.table.snapshot(self._feed_time)
+
+        started = loop.time()
+        conflicts = await asyncio.to_thread(
+            self.detector.detect, traffic, self.lookahead_s, self.sep_nm, self.sep_ft,
+        )
+        finished = loop.time()
+
+        latency_s = finished - pending if pending is not None else 0.0
+        self.stats.cycles += 1
+        self.stats.detect_s += finished - started
+        self.stats.total_latency_s += latency_s
+        self.stats.max_latency_s = max(self.stats.max_latency_s, latency_s)
+
+        update = ConflictUpdate(self._feed_time, conflicts, len(traffic), latency_s)
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(update)
+
+    async def run(self, source) -> ReplayStats:
+        """
+        Runs until the source is exhausted, then detects once more.
+
+        Args:
+            source: Async iterable of state-vector dictionaries
+
+        Returns:
+            ReplayStats of the run
+        """
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        ingest = asyncio.create_task(self._ingest(source))
+        try:
+            # Ticks are scheduled on the loop clock, so the period does not
+            # stretch by the detection time
+            next_tick = loop.time()
+            while True:
+                next_tick += self.cadence_s
+                done, _ = await asyncio.wait(
+                    {ingest}, timeout=max(0.0, next_tick - loop.time())
+                )
+                if done:
+                    break
+                await self._detect_once()
+            ingest.result()
+            await self._detect_once()
+        finally:
+            ingest.cancel()
+            self.stats.elapsed_s = time.perf_counter() - started
+
+        return self.stats
+
+
+def _address(text: str):
+    host, port = text.rsplit(":", 1)
+    return host, int(port)
+
+
+async def _main(args):
+    def make_source():
+        return FileReplay(args.input, args.speed, args.start, args.end)
+
+    source = make_source() if args.input else None
+
+    if args.serve:
+        server = await start_replay_server(make_source, *_address(args.serve))
+        print(f"Serving {args.input} on {args.serve}")
+        async with server:
+            await server.serve_forever()
+
+    if args.connect:
+        source = read_socket(*_address(args.connect))
+
+    pipeline = ReplayPipeline(
+        args.cadence, args.lookahead, args.sep_nm, args.sep_ft,
+        LatestStateTable(args.capacity, args.max_age),
+    )
+    updates = pipeline.subscribe()
+
+    async def report():
+        while True:
+            update = await updates.get()
+            print(
+                f"t={update.feed_time:.0f} aircraft={update.aircraft} "
+                f"conflicts={len(update.conflicts)} latency={update.latency_s * 1e3:.1f} ms"
+            )
+
+    reporter = asyncio.create_task(report())
+    stats = await pipeline.run(source)
+    reporter.cancel()
+
+    lag = f" | max source lag {source.max_lag_s:.2f} s" if isinstance(source, FileReplay) else ""
+    print(
+        f"Messages: {stats.messages:,} | {stats.message_rate:,.0f} msg/s | "
+        f"Cycles: {stats.cycles} | "
+        f"Latency mean {stats.mean_latency_s * 1e3:.1f} ms, max {stats.max_latency_s * 1e3:.1f} ms"
+        f"{lag}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.replay",
+        description="Replay recorded traffic as a live feed through a rolling detector.",
+    )
+    parser.add_argument("input", nargs="?", help="Parquet dataset directory or CSV file")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed factor (inf: unthrottled)")
+    parser.add_argument("--start", type=float, default=None, help="first timestamp to replay")
+    parser.add_argument("--end", type=float, default=None, help="last timestamp to replay")
+    parser.add_argument("--cadence", type=float, default=1.0, help="seconds between detections")
+    parser.add_argument("--lookahead", type=float, default=DEFAULT_LOOKAHEAD_S)
+    parser.add_argument("--sep-nm", type=float, default=DEFAULT_HORIZONTAL_SEP_NM)
+    parser.add_argument("--sep-ft", type=float, default=DEFAULT_VERTICAL_SEP_FT)
+    parser.add_argument("--capacity", type=int, default=DEFAULT_REPLAY_CAPACITY, help="max aircraft kept")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_STATE_MAX_AGE_S, help="drop positions older than this [s]")
+    parser.add_argument("--serve", metavar="HOST:PORT", help="serve the replay as JSON lines instead")
+    parser.add_argument("--connect", metavar="HOST:PORT", help="consume JSON lines from a socket")
+    args = parser.parse_args(argv)
+
+    if bool(args.input) == bool(args.connect):
+        parser.error("give either an input or --connect")
+
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
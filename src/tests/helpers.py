@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+
+def make_random_snapshot(n, seed=0, lat=(50.0, 51.0), lon=(8.0, 10.0), vertrate_std=2.0):
+    """
+    Helper to create a dense random snapshot.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "icao24": [f"{k:06x}" for k in range(n)],
+        "lat": rng.uniform(*lat, n),
+        "lon": rng.uniform(*lon, n),
+        "velocity": rng.uniform(100.0, 250.0, n),
+        "heading": rng.uniform(0.0, 360.0, n),
+        "baroaltitude": rng.uniform(9_000.0, 10_000.0, n),
+        "vertrate": rng.normal(0.0, vertrate_std, n),
+    })
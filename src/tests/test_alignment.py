@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from src.constants import EARTH_RADIUS_M
+from src.domain.alignment import align_states
+from src.domain.cpa import detect_conflicts
+from src.domain.geometry import latlon_to_xy
+
+
+def make_pair(lag_a_s=0.0, lag_b_s=0.0):
+    """
+    Helper for two aircraft flying head-on, 40 km apart at time 100,
+    with positions reported ``lag`` seconds earlier.
+    """
+    true_x = np.array([-20_000.0, 20_000.0])
+    lags = np.array([lag_a_s, lag_b_s])
+    vx = np.array([200.0, -200.0])
+    # Reported positions are where each aircraft was at lastposupdate
+    reported_x = true_x - vx * lags
+    return pd.DataFrame({
+        "time": [100, 100],
+        "icao24": ["a", "b"],
+        "lat": [50.0, 50.0],
+        "lon": 9.0 + np.degrees(reported_x / (EARTH_RADIUS_M * np.cos(np.radians(50.0)))),
+        "velocity": [200.0, 200.0],
+        "heading": [90.0, 270.0],
+        "vertrate": [1.0, 0.0],
+        "baroaltitude": [10_000.0, 10_000.0],
+        "lastposupdate": 100 - lags,
+    })
+
+
+def test_alignment_removes_t_cpa_bias():
+    """
+    Extrapolating lagging positions to the snapshot time recovers the
+    t_cpa of up-to-date positions, and the climb of aircraft a.
+    """
+    truth = detect_conflicts(make_pair())
+    lagging = make_pair(lag_a_s=8.0, lag_b_s=2.0)
+
+    biased = detect_conflicts(lagging)
+    aligned_states = align_states(lagging)
+    aligned = detect_conflicts(aligned_states)
+
+    assert abs(biased["t_cpa"].iloc[0] - truth["t_cpa"].iloc[0]) > 4.0
+    assert abs(aligned["t_cpa"].iloc[0] - truth["t_cpa"].iloc[0]) < 0.01
+    assert aligned_states["baroaltitude"].tolist() == [10_008.0, 10_000.0]
+
+
+def test_stale_states_dropped_and_dtypes_kept():
+    """
+    States older than the limit are dropped, states without a position
+    time are kept as reported, and float32 columns stay float32.
+    """
+    states = pd.concat([make_pair(lag_a_s=30.0), make_pair()], ignore_index=True)
+    states.loc[3, "lastposupdate"] = np.nan
+    states["lat"] = states["lat"].astype(np.float32)
+
+    aligned = align_states(states, max_age_s=15)
+
+    assert aligned.index.tolist() == [1, 2, 3]
+    assert aligned["lat"].dtype == np.float32
+    pd.testing.assert_series_equal(aligned.loc[3], states.loc[3])
+
+    x, _ = latlon_to_xy(np.full(3, 50.0), aligned["lon"].to_numpy(), 50.0, 9.0)
+    assert np.allclose(x, [20_000.0, -20_000.0, 20_000.0])
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+from src.domain.broadphase import (
+    all_pairs,
+    iter_all_pairs,
+    grid_pairs,
+    altitude_intervals,
+    altitude_band_pairs,
+    altitude_band_mask,
+)
+
+
+def test_grid_pairs_contains_all_close_pairs():
+    """
+    Every pair closer than the cell size is a grid candidate.
+    """
+    rng = np.random.default_rng(1)
+    x_m = rng.uniform(-500_000.0, 500_000.0, 400)
+    y_m = rng.uniform(-300_000.0, 300_000.0, 400)
+    cell_size_m = 60_000.0
+
+    own, intr = grid_pairs(x_m, y_m, cell_size_m)
+    candidates = list(zip(own.tolist(), intr.tolist()))
+
+    ref_own, ref_intr = all_pairs(len(x_m))
+    close = np.hypot(x_m[ref_intr] - x_m[ref_own], y_m[ref_intr] - y_m[ref_own]) < cell_size_m
+
+    assert set(zip(ref_own[close].tolist(), ref_intr[close].tolist())) <= set(candidates)
+    assert len(candidates) == len(set(candidates))
+    assert all(a < b for a, b in candidates)
+    assert len(candidates) < len(ref_own)
+
+
+def test_grid_pairs_skips_missing_positions():
+    """
+    Aircraft without a position never appear in a candidate pair.
+    """
+    x_m = np.array([0.0, np.nan, 1_000.0])
+    y_m = np.array([0.0, 0.0, 0.0])
+
+    own, intr = grid_pairs(x_m, y_m, 10_000.0)
+
+    assert own.tolist() == [0]
+    assert intr.tolist() == [2]
+
+
+def test_altitude_band_pairs_matches_mask():
+    """
+    Sweep-generated altitude pairs equal the band mask applied to all pairs,
+    and aircraft with unknown altitude pair with everyone.
+    """
+    rng = np.random.default_rng(2)
+    altitude_m = rng.choice(np.arange(3_000.0, 12_000.0, 300.0), 200)
+    vertical_rate_mps = np.where(rng.random(200) < 0.2, rng.normal(0.0, 8.0, 200), 0.0)
+    altitude_m[7] = np.nan
+
+    lower_m, upper_m = altitude_intervals(altitude_m, vertical_rate_mps, 120)
+    own, intr = altitude_band_pairs(lower_m, upper_m, 304.8)
+
+    ref_own, ref_intr = all_pairs(len(altitude_m))
+    keep = altitude_band_mask(ref_own, ref_intr, lower_m, upper_m, 304.8)
+
+    pairs = list(zip(own.tolist(), intr.tolist()))
+    assert sorted(pairs) == list(zip(ref_own[keep].tolist(), ref_intr[keep].tolist()))
+    assert np.count_nonzero((own == 7) | (intr == 7)) == len(altitude_m) - 1
+    assert len(own) < len(ref_own) // 4
+
+
+def test_iter_all_pairs_tiles_cover_upper_triangle():
+    """
+    Row tiles enumerate the upper triangle in order, within the tile size.
+    """
+    tiles = list(iter_all_pairs(50, tile_pairs=97))
+    own, intr = all_pairs(50)
+
+    assert all(len(tile_own) <= 97 for tile_own, _ in tiles)
+    assert np.concatenate([t[0] for t in tiles]).tolist() == own.tolist()
+    assert np.concatenate([t[1] for t in tiles]).tolist() == intr.tolist()
+
+
+
+def test_grid_pairs_rejects_empty_cells():
+    """
+    A cell size of zero cannot bin aircraft and is rejected.
+    """
+    x_m = np.array([0.0, 1_000.0])
+    y_m = np.array([0.0, 0.0])
+
+    with pytest.raises(ValueError):
+        grid_pairs(x_m, y_m, 0.0)
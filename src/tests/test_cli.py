@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import pandas as pd
+from src.cli import main
+from src.data.dataset import write_dataset
+from src.domain.cpa import detect_conflicts_over_range
+from src.tests.helpers import make_random_snapshot
+
+
+def test_windowed_batch_run_matches_range_detection(tmp_path):
+    """
+    Processing a dataset window by window writes the same conflicts as
+    one range detection over the whole period.
+    """
+    frames = []
+    for k, t in enumerate(range(1_000, 1_100, 10)):
+        snapshot = make_random_snapshot(100, seed=k)
+        snapshot["time"] = t
+        snapshot["callsign"] = ""
+        frames.append(snapshot)
+    states = pd.concat(frames, ignore_index=True)
+    write_dataset(states, tmp_path / "ds", bucket_s=30)
+
+    output = tmp_path / "conflicts.parquet"
+    main([str(tmp_path / "ds"), str(output), "--start", "1010", "--window", "25"])
+
+    expected = detect_conflicts_over_range(states, t_start=1_010)
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(pd.read_parquet(output), expected)
+
+
+def test_empty_range_writes_empty_file(tmp_path):
+    """
+    A range without snapshots still writes a file with the conflict
+    columns, in every format.
+    """
+    write_dataset(make_random_snapshot(10).assign(time=1_000, callsign=""), tmp_path / "ds")
+
+    for name in ("conflicts.parquet", "conflicts.csv", "conflicts.jsonl"):
+        main([str(tmp_path / "ds"), str(tmp_path / name), "--start", "5000"])
+
+        assert (tmp_path / name).exists()
+    assert pd.read_parquet(tmp_path / "conflicts.parquet").empty
+    assert list(pd.read_csv(tmp_path / "conflicts.csv").columns) == [
+        "time", "a", "b", "t_cpa", "d_cpa_nm", "vert_sep_ft", "cpa_x", "cpa_y",
+    ]
+
+
+def test_cli_does_not_import_ui_packages():
+    """
+    The batch entry point starts without streamlit or pydeck.
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, src.cli; print('streamlit' in sys.modules or 'pydeck' in sys.modules)"],
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == "False"
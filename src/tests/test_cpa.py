@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from src.domain.cpa import compute_cpa
+from src.domain.cpa import compute_cpa, compute_cpa_batch
 
 
 def test_compute_cpa_head_on():
@@ -46,3 +46,34 @@ def test_compute_cpa_zero_relative_velocity():
 
     assert t_cpa is None
     assert np.isclose(d_cpa, np.linalg.norm(relative_position_m))
+
+
+def test_compute_cpa_batch_matches_scalar():
+    """
+    Batch CPA agrees with the scalar version, including undefined CPA time.
+    """
+    relative_position_m = np.array([
+        [10_000.0, 0.0],
+        [0.0, 5_000.0],
+        [1_000.0, 1_000.0],
+    ])
+    relative_velocity_mps = np.array([
+        [-200.0, 0.0],
+        [100.0, 0.0],
+        [0.0, 0.0],
+    ])
+
+    t_cpa, d_cpa = compute_cpa_batch(
+        relative_position_m, relative_velocity_mps
+    )
+
+    for k in range(len(relative_position_m)):
+        t_ref, d_ref = compute_cpa(
+            relative_position_m[k], relative_velocity_mps[k]
+        )
+        if t_ref is None:
+            assert np.isnan(t_cpa[k])
+        else:
+            assert np.isclose(t_cpa[k], t_ref)
+        assert np.isclose(d_cpa[k], d_ref)
+
@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+from src.data.dataset import APP_COLUMNS, csv_to_dataset, load_traffic, write_dataset
+
+
+def make_states(times, n=5):
+    """
+    Helper to create states for n aircraft at each timestamp.
+    """
+    rows = []
+    for t in times:
+        for k in range(n):
+            rows.append({
+                "time": t,
+                "icao24": f"{k:06x}",
+                "callsign": f"SYN{k:03d}",
+                "lat": 50.0 + k,
+                "lon": 8.0 + t / 1_000,
+                "velocity": 200.0,
+                "heading": 90.0,
+                "vertrate": 0.0,
+                "baroaltitude": 10_000.0,
+                "lastposupdate": t - 1.5,
+                "onground": False,
+            })
+    return pd.DataFrame(rows)
+
+
+def test_dataset_round_trip_keeps_app_columns(tmp_path):
+    """
+    Chunked writes read back in order, with only the app columns.
+    """
+    states = make_states(range(0, 1_800, 60))
+    write_dataset([states.iloc[:70], states.iloc[70:]], tmp_path / "ds", bucket_s=600)
+
+    loaded = load_traffic(str(tmp_path / "ds"))
+
+    assert list(loaded.columns) == APP_COLUMNS
+    pd.testing.assert_frame_equal(loaded, states[APP_COLUMNS])
+    assert len(list((tmp_path / "ds").iterdir())) == 3
+
+
+def test_time_range_matches_csv(tmp_path):
+    """
+    Column and time-range selection give the same rows for the Parquet
+    dataset and the CSV it was converted from.
+    """
+    csv_path = tmp_path / "states.csv"
+    make_states(range(0, 3_000, 10)).to_csv(csv_path, index=False)
+    csv_to_dataset(str(csv_path), str(tmp_path / "ds"), chunk_rows=333)
+
+    for path in (str(tmp_path / "ds"), str(csv_path)):
+        loaded = load_traffic(path, ["time", "lat"], t_start=595, t_end=1_210)
+
+        assert list(loaded.columns) == ["time", "lat"]
+        assert loaded["time"].min() == 600
+        assert loaded["time"].max() == 1_210
+        assert len(loaded) == 62 * 5
+
+
+def test_compact_mode_stays_within_a_metre(tmp_path):
+    """
+    Compact loads use float32 and categoricals for both storage formats,
+    with positions within a metre of the full-precision values.
+    """
+    states = make_states(range(0, 600, 10))
+    states["lon"] = np.linspace(-179.9, 179.9, len(states))
+    csv_path = tmp_path / "states.csv"
+    states.to_csv(csv_path, index=False)
+    csv_to_dataset(str(csv_path), str(tmp_path / "ds"))
+
+    for path in (str(tmp_path / "ds"), str(csv_path)):
+        full = load_traffic(path)
+        compact = load_traffic(path, compact=True)
+
+        assert compact["lat"].dtype == np.float32
+        assert compact["time"].dtype == np.int64
+        assert isinstance(compact["icao24"].dtype, pd.CategoricalDtype)
+        assert compact["icao24"].astype(str).tolist() == full["icao24"].tolist()
+
+        lon_error_m = np.radians(np.abs(compact["lon"].astype(float) - full["lon"])) * 6_371_000
+        assert lon_error_m.max() < 1.0
+
+
+def test_missing_lastposupdate_reads_as_null(tmp_path):
+    """
+    Inputs without the optional lastposupdate column load with nulls in
+    its place, from both storage formats.
+    """
+    states = make_states(range(0, 600, 10)).drop(columns="lastposupdate")
+    csv_path = tmp_path / "states.csv"
+    states.to_csv(csv_path, index=False)
+    write_dataset(states, tmp_path / "ds")
+
+    for path in (str(tmp_path / "ds"), str(csv_path)):
+        loaded = load_traffic(path)
+
+        assert list(loaded.columns) == APP_COLUMNS
+        assert loaded["lastposupdate"].isna().all()
+        assert len(loaded) == len(states)
+
+
+def test_time_range_with_non_default_bucket_width(tmp_path):
+    """
+    Buckets wider than the default are pruned by their stored width, so
+    a range starting inside a bucket still finds its states.
+    """
+    states = make_states(range(0, 7_200, 60))
+    write_dataset(states, tmp_path / "ds", bucket_s=3_600)
+
+    loaded = load_traffic(str(tmp_path / "ds"), t_start=4_500, t_end=5_000)
+
+    assert len(loaded) == len(states[states["time"].between(4_500, 5_000)])
+    assert loaded["time"].min() == 4_500
+
+
+def test_overwrite_removes_old_buckets(tmp_path):
+    """
+    Rewriting a dataset with a shorter range leaves none of the old buckets.
+    """
+    write_dataset(make_states([0, 700, 1_400]), tmp_path / "ds", bucket_s=600)
+    states = make_states([0])
+    write_dataset(states, tmp_path / "ds", bucket_s=600)
+
+    loaded = load_traffic(str(tmp_path / "ds"))
+
+    pd.testing.assert_frame_equal(loaded, states[APP_COLUMNS])
+    assert len(list((tmp_path / "ds").iterdir())) == 1
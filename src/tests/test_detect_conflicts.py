@@ -1,6 +1,22 @@
 
+import tracemalloc
+import numpy as np
 import pandas as pd
-from src.domain.cpa import detect_conflicts
+import pytest
+from src.domain.aircraft import TrafficSnapshot
+from src.domain.cpa import (
+    DetectionStats,
+    detect_conflicts,
+    detect_conflicts_reference,
+    detect_conflicts_over_range,
+    find_conflict,
+    rank_conflicts,
+    SEVERITY_KEYS,
+    VerletConflictDetector,
+    sweep_conflicts,
+    tile_pairs_for_memory,
+)
+from src.tests.helpers import make_random_snapshot
 
 
 def make_snapshot(rows):
@@ -43,7 +59,7 @@ def test_detects_simple_horizontal_conflict():
     )
 
     assert len(conflicts) == 1
-    c = conflicts[0]
+    c = conflicts.iloc[0]
 
     assert {"a", "b"} == {c["a"], c["b"]}
     assert c["d_cpa_nm"] < 5.0
@@ -82,7 +98,7 @@ def test_no_conflict_due_to_vertical_separation():
         sep_ft=1000,
     )
 
-    assert conflicts == []
+    assert conflicts.empty
 
 
 def test_conflict_symmetry():
@@ -113,3 +129,230 @@ def test_conflict_symmetry():
     conflicts = detect_conflicts(snapshot)
 
     assert len(conflicts) == 1
+    assert find_conflict(conflicts, "y", "x") is not None
+    assert find_conflict(conflicts, "x", "z") is None
+
+
+def test_vectorized_matches_reference():
+    """
+    Vectorized engine returns the same conflicts, in the same order,
+    as the reference loop.
+    """
+    snapshot = make_random_snapshot(150)
+    snapshot.loc[3, "baroaltitude"] = np.nan
+
+    for lookahead_s, sep_nm, sep_ft in [(120, 5.0, 1000), (300, 10.0, 3000)]:
+        conflicts = detect_conflicts(snapshot, lookahead_s, sep_nm, sep_ft)
+        expected = detect_conflicts_reference(snapshot, lookahead_s, sep_nm, sep_ft)
+
+        assert len(conflicts) > 0
+        assert list(conflicts.index) == [(c["a"], c["b"]) for c in expected]
+        for c, e in zip(conflicts.to_dict("records"), expected):
+            for key in ("t_cpa", "d_cpa_nm", "vert_sep_ft", "cpa_x", "cpa_y"):
+                assert np.isclose(c[key], e[key], equal_nan=True)
+
+
+def test_traffic_snapshot_matches_dataframe_input():
+    """
+    A TrafficSnapshot built from a frame shares its float columns and gives
+    the same conflicts as the frame itself.
+    """
+    snapshot = make_random_snapshot(100)
+    traffic = TrafficSnapshot.from_frame(snapshot)
+
+    assert np.shares_memory(traffic.lat_deg, snapshot["lat"].to_numpy())
+    pd.testing.assert_frame_equal(
+        detect_conflicts(traffic, 300, 10.0, 3000),
+        detect_conflicts(snapshot, 300, 10.0, 3000),
+    )
+
+
+def test_grid_broad_phase_prunes_without_changing_results():
+    """
+    Grid broad phase finds the same conflicts as the all-pairs path
+    and reports how many pairs it pruned.
+    """
+    snapshot = make_random_snapshot(300)
+    snapshot["lon"] = np.linspace(0.0, 20.0, len(snapshot))
+
+    stats = DetectionStats()
+    conflicts = detect_conflicts(snapshot, broad_phase="grid", stats=stats)
+    expected = detect_conflicts(snapshot, broad_phase="none")
+
+    assert list(conflicts.index) == list(expected.index)
+    assert stats.total_pairs == 300 * 299 // 2
+    assert stats.pruned_by_broad_phase > 0
+    assert stats.conflicts == len(conflicts)
+    assert stats.broad_phase_pairs == (
+        stats.pruned_by_distance
+        + stats.rejected_by_t_cpa
+        + stats.rejected_horizontally
+        + stats.rejected_vertically
+        + stats.conflicts
+    )
+
+
+def test_altitude_slabs_do_not_change_results():
+    """
+    Altitude slab pruning, alone or with the grid, keeps every conflict.
+    """
+    snapshot = make_random_snapshot(300)
+    snapshot["baroaltitude"] = np.repeat(np.arange(3_000.0, 12_000.0, 300.0), 10)
+
+    expected = detect_conflicts_reference(snapshot)
+    assert len(expected) > 0
+
+    for broad_phase in ("grid", "none"):
+        stats = DetectionStats()
+        conflicts = detect_conflicts(
+            snapshot, broad_phase=broad_phase, altitude_slabs=True, stats=stats
+        )
+
+        assert list(conflicts.index) == [(c["a"], c["b"]) for c in expected]
+        assert stats.pruned_by_altitude > 0
+
+
+def test_over_range_matches_per_snapshot_detection():
+    """
+    Range detection equals calling detect_conflicts on every snapshot
+    between t_start and t_end, regardless of row order.
+    """
+    frames = []
+    for k, t in enumerate([100, 110, 120, 130]):
+        snapshot = make_random_snapshot(120, seed=k)
+        snapshot["time"] = t
+        frames.append(snapshot)
+    df = pd.concat(frames).sample(frac=1.0, random_state=0)
+
+    result = detect_conflicts_over_range(df, t_start=110, t_end=120)
+
+    expected = [
+        (t, a, b)
+        for t in (110, 120)
+        for a, b in detect_conflicts(df[df["time"] == t]).index
+    ]
+    assert len(expected) > 0
+    assert list(zip(result["time"], result["a"], result["b"])) == expected
+
+
+def test_verlet_detector_matches_full_recompute():
+    """
+    Reusing the neighbour list between consecutive snapshots gives the
+    same conflicts as a full recompute, and rebuilds only when needed.
+    """
+    snapshot = make_random_snapshot(200)
+    heading_rad = np.radians(snapshot["heading"])
+    detector = VerletConflictDetector(skin_m=5_000.0)
+
+    for step in range(12):
+        moved = snapshot.copy()
+        dt = 10.0 * step
+        moved["lat"] += snapshot["velocity"] * np.cos(heading_rad) * dt / 111_000
+        moved["lon"] += snapshot["velocity"] * np.sin(heading_rad) * dt / 70_000
+        if step == 6:
+            moved = moved.iloc[::-1].drop(index=[0, 1])
+
+        conflicts = detector.detect(moved)
+        expected = detect_conflicts(moved)
+
+        assert len(expected) > 0
+        pd.testing.assert_frame_equal(conflicts, expected)
+
+    assert 1 < detector.rebuilds < 12
+
+
+def test_sweep_matches_individual_runs():
+    """
+    Every combination in a parameter sweep gives the same conflicts
+    as a separate detect_conflicts call.
+    """
+    snapshot = make_random_snapshot(150)
+
+    counts, conflicts = sweep_conflicts(
+        snapshot,
+        lookahead_values=[60, 120, 300],
+        sep_nm_values=[3.0, 5.0],
+        sep_ft_values=[500, 1000],
+        return_conflicts=True,
+    )
+
+    assert len(counts) == 3 * 2 * 2
+    for row in counts.itertuples():
+        expected = detect_conflicts(snapshot, row.lookahead_s, row.sep_nm, row.sep_ft)
+        found = conflicts[(row.lookahead_s, row.sep_nm, row.sep_ft)]
+
+        assert row.conflicts == len(expected)
+        assert list(found.index) == list(expected.index)
+    assert counts["conflicts"].max() > 0
+
+
+def test_tiled_evaluation_bounds_memory():
+    """
+    Small pair tiles give the same conflicts as the default tile size
+    while keeping peak memory within the budget.
+    """
+    snapshot = make_random_snapshot(2_000)
+    snapshot["baroaltitude"] = np.linspace(1_000.0, 12_000.0, len(snapshot))
+    expected = detect_conflicts(snapshot, broad_phase="none", altitude_slabs=False)
+
+    budget_bytes = 4_000_000
+    max_tile_pairs = tile_pairs_for_memory(budget_bytes)
+    stats = DetectionStats()
+
+    tracemalloc.start()
+    conflicts = detect_conflicts(
+        snapshot,
+        broad_phase="none",
+        altitude_slabs=False,
+        stats=stats,
+        max_tile_pairs=max_tile_pairs,
+    )
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert list(conflicts.index) == list(expected.index)
+    assert stats.max_tile_pairs <= max_tile_pairs
+    assert stats.tiles == -(-stats.total_pairs // max_tile_pairs)
+    assert stats.peak_tile_bytes <= budget_bytes
+    assert peak_bytes < 2 * budget_bytes
+
+
+def test_rank_conflicts_matches_stable_sort():
+    """
+    Partial-selection ranking returns the same rows, pages included, as
+    a stable full sort, including ties at page boundaries and missing
+    vertical separations, which rank last.
+    """
+    snapshot = make_random_snapshot(400)
+    snapshot.loc[3, "baroaltitude"] = np.nan
+    conflicts = detect_conflicts(snapshot, 300, 10.0, 3000)
+    conflicts["vert_sep_ft"] = conflicts["vert_sep_ft"].round(-2)
+    assert len(conflicts) > 100
+    assert conflicts["vert_sep_ft"].isna().any()
+
+    for by in SEVERITY_KEYS:
+        expected = conflicts.sort_values(by, kind="stable")
+        for offset, k in [(0, 10), (10, 25), (90, 50), (0, len(conflicts) + 5)]:
+            pd.testing.assert_frame_equal(
+                rank_conflicts(conflicts, k, by=by, offset=offset),
+                expected.iloc[offset:offset + k],
+            )
+
+    assert rank_conflicts(conflicts, 10, offset=len(conflicts)).empty
+    with pytest.raises(ValueError):
+        rank_conflicts(conflicts, 10, by="a")
+
+
+def test_zero_lookahead_and_separation():
+    """
+    With no look-ahead and no separation minimum the grid has no cell
+    size; detection still runs and finds nothing.
+    """
+    snapshot = make_random_snapshot(50)
+
+    for broad_phase in ("grid", "none"):
+        conflicts = detect_conflicts(snapshot, 0, 0.0, 0.0, broad_phase=broad_phase)
+        assert conflicts.empty
+
+    detector = VerletConflictDetector(skin_m=0.0)
+    assert detector.detect(snapshot, 0, 0.0, 0.0).empty
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.domain.cpa import detect_conflicts
+from src.domain.episodes import ConflictEpisodeTracker, episodes_to_frame
+from src.tests.helpers import make_random_snapshot
+
+
+def make_conflicts(rows):
+    """
+    Helper to create a per-snapshot conflict DataFrame.
+    """
+    return pd.DataFrame(rows, columns=["a", "b", "t_cpa", "d_cpa_nm", "vert_sep_ft"])
+
+
+def test_episode_spans_consecutive_snapshots():
+    """
+    A pair in conflict over several snapshots is one episode, and a gap
+    starts a new one, even if the pair order flips.
+    """
+    tracker = ConflictEpisodeTracker()
+    closed = []
+    closed += tracker.update(0, make_conflicts([("x", "y", 120.0, 3.0, 500.0)]))
+    closed += tracker.update(10, make_conflicts([("y", "x", 110.0, 2.0, 800.0)]))
+    closed += tracker.update(20, make_conflicts([]))
+    closed += tracker.update(30, make_conflicts([("x", "y", 90.0, 4.0, 100.0)]))
+    closed += tracker.flush()
+
+    episodes = episodes_to_frame(closed)
+
+    assert list(episodes["start_time"]) == [0, 30]
+    assert list(episodes["end_time"]) == [10, 30]
+    assert list(episodes["min_d_cpa_nm"]) == [2.0, 4.0]
+    assert list(episodes["min_vert_sep_ft"]) == [500.0, 100.0]
+    assert list(episodes["first_alert_lead_s"]) == [120.0, 90.0]
+    assert list(episodes["snapshots"]) == [2, 1]
+
+
+def test_episodes_match_post_processing():
+    """
+    Streaming episodes agree with grouping the raw per-snapshot rows.
+    """
+    snapshot = make_random_snapshot(80, seed=1, lat=(50.0, 50.5), lon=(8.0, 9.0), vertrate_std=0.0)
+    heading_rad = np.radians(snapshot["heading"])
+
+    tracker = ConflictEpisodeTracker()
+    closed, rows = [], []
+    for t in range(0, 300, 10):
+        moved = snapshot.copy()
+        moved["lat"] += snapshot["velocity"] * np.cos(heading_rad) * t / 111_000
+        moved["lon"] += snapshot["velocity"] * np.sin(heading_rad) * t / 70_000
+        conflicts = detect_conflicts(moved, lookahead_s=60)
+        closed += tracker.update(t, conflicts)
+        rows.append(conflicts.assign(time=t))
+    closed += tracker.flush()
+
+    episodes = episodes_to_frame(closed)
+    raw = pd.concat(rows, ignore_index=True)
+
+    assert len(episodes) > 0
+    assert episodes["snapshots"].sum() == len(raw)
+    for episode in episodes.itertuples():
+        pair = raw[
+            ((raw["a"] == episode.a) & (raw["b"] == episode.b))
+            | ((raw["a"] == episode.b) & (raw["b"] == episode.a))
+        ]
+        within = pair[pair["time"].between(episode.start_time, episode.end_time)]
+        assert len(within) == episode.snapshots
+        assert within["d_cpa_nm"].min() == episode.min_d_cpa_nm
+        assert within["t_cpa"].iloc[0] == episode.first_alert_lead_s
+
+
+def test_repeated_snapshot_time_rejected():
+    """
+    Feeding the same snapshot twice raises instead of counting it twice.
+    """
+    tracker = ConflictEpisodeTracker()
+    conflicts = make_conflicts([("x", "y", 120.0, 3.0, 500.0)])
+    tracker.update(0, conflicts)
+
+    with pytest.raises(ValueError):
+        tracker.update(0, conflicts)
+
+    assert tracker.open_episodes[0].snapshots == 1
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from src.constants import EARTH_RADIUS_M, WGS84_A_M, WGS84_F
+from src.domain.aircraft import AircraftState, TrafficSnapshot
+from src.domain.geometry import LocalProjection, xy_to_lonlat
+from src.tests.helpers import make_random_snapshot
+from src.ui.utils import project_future_paths
+
+
+def test_future_paths_match_aircraft_state_projection():
+    """
+    Vectorized paths equal per-aircraft straight-line projections built
+    from AircraftState, whatever the vertical rate.
+    """
+    n = 40
+    snapshot = make_random_snapshot(n, vertrate_std=10.0)
+    traffic = TrafficSnapshot.from_frame(snapshot)
+    lat0, lon0 = traffic.reference_point()
+    time_steps = np.arange(0, 121, 10)
+
+    projection = LocalProjection(lat0, lon0)
+    paths = project_future_paths(traffic, projection, lookahead=120, step=10, with_altitude=True)
+
+    assert paths.shape == (n, len(time_steps), 3)
+    np.testing.assert_array_equal(
+        project_future_paths(traffic, projection, lookahead=120, step=10), paths[..., :2]
+    )
+    for i, row in enumerate(snapshot.itertuples()):
+        state = AircraftState(
+            row.icao24, row.lat, row.lon, row.velocity, row.heading,
+            row.baroaltitude, row.vertrate,
+        )
+        position = state.position_xy(lat0, lon0)
+        velocity = state.velocity_vector()
+        lon, lat = xy_to_lonlat(
+            position[0] + velocity[0] * time_steps,
+            position[1] + velocity[1] * time_steps,
+            lat0, lon0,
+        )
+        altitude = state.altitude_m + state.vertical_rate_mps * time_steps
+        np.testing.assert_allclose(paths[i], np.column_stack((lon, lat, altitude)), atol=1e-9)
+
+
+def test_future_path_of_known_motion():
+    """
+    An eastbound aircraft at 200 m/s climbing at 10 m/s moves 6 km east
+    and 300 m up every 30 s. In ENU mode the tangent plane leaves the
+    parallel, so the path drifts south by x**2 * tan(lat) / (2 * N).
+    """
+    traffic = TrafficSnapshot.from_frame(pd.DataFrame({
+        "icao24": ["a"], "lat": [50.0], "lon": [9.0], "velocity": [200.0],
+        "heading": [90.0], "baroaltitude": [10_000.0], "vertrate": [10.0],
+    }))
+    lat_rad = np.radians(50.0)
+    east_m = np.array([0.0, 6_000.0, 12_000.0])
+
+    # WGS84 prime vertical and meridian radii of curvature at 50 deg
+    e2 = WGS84_F * (2.0 - WGS84_F)
+    w = np.sqrt(1.0 - e2 * np.sin(lat_rad) ** 2)
+    prime_vertical_m = WGS84_A_M / w
+    meridian_m = WGS84_A_M * (1.0 - e2) / w ** 3
+
+    expected = {
+        "flat": (
+            np.degrees(east_m / (EARTH_RADIUS_M * np.cos(lat_rad))),
+            np.zeros(3),
+            EARTH_RADIUS_M, EARTH_RADIUS_M,
+        ),
+        "enu": (
+            np.degrees(np.arctan(east_m / (prime_vertical_m * np.cos(lat_rad)))),
+            -np.degrees(east_m ** 2 * np.tan(lat_rad) / (2.0 * prime_vertical_m * meridian_m)),
+            prime_vertical_m, meridian_m,
+        ),
+    }
+
+    for mode, (d_lon, d_lat, east_radius_m, north_radius_m) in expected.items():
+        path = project_future_paths(
+            traffic, LocalProjection(50.0, 9.0, mode), 60, 30, with_altitude=True
+        )[0]
+
+        east_error_m = np.radians(path[:, 0] - 9.0 - d_lon) * east_radius_m * np.cos(lat_rad)
+        north_error_m = np.radians(path[:, 1] - 50.0 - d_lat) * north_radius_m
+        assert np.abs(east_error_m).max() < 0.5
+        assert np.abs(north_error_m).max() < 0.5
+        np.testing.assert_allclose(path[:, 2], [10_000.0, 10_300.0, 10_600.0])
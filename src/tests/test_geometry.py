@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+from src.constants import WGS84_A_M, WGS84_F
+from src.domain.cpa import detect_conflicts, find_conflict
+from src.domain.geometry import LocalProjection, latlon_to_xy, xy_to_lonlat
+
+
+def test_flat_projection_matches_scalar_functions():
+    """
+    Flat mode reproduces latlon_to_xy / xy_to_lonlat on whole arrays.
+    """
+    lat = np.array([47.0, 51.0, 55.0])
+    lon = np.array([5.0, 10.0, 15.0])
+    projection = LocalProjection(51.0, 10.0)
+
+    x, y = projection.to_xy(lat, lon)
+    expected = latlon_to_xy(lat, lon, 51.0, 10.0)
+
+    assert np.allclose(x, expected[0])
+    assert np.allclose(y, expected[1])
+
+    lon_back, lat_back = projection.to_lonlat(x, y)
+    expected_lon, expected_lat = xy_to_lonlat(x, y, 51.0, 10.0)
+
+    assert np.allclose(lon_back, expected_lon)
+    assert np.allclose(lat_back, expected_lat)
+
+
+def test_enu_projection_round_trip():
+    """
+    ENU mode converts back to the original coordinates.
+    """
+    lat = np.array([47.0, 51.0, 55.0, 60.0])
+    lon = np.array([5.0, 10.0, 15.0, -3.0])
+    projection = LocalProjection(51.0, 10.0, mode="enu")
+
+    lon_back, lat_back = projection.to_lonlat(*projection.to_xy(lat, lon))
+
+    assert np.allclose(lon_back, lon, atol=1e-9)
+    assert np.allclose(lat_back, lat, atol=1e-9)
+
+
+def test_enu_preserves_distances_far_from_reference():
+    """
+    Far from the reference point, ENU keeps local east-west distances
+    where the flat-earth approximation distorts them.
+    """
+    lat = np.array([56.0, 56.0])
+    lon = np.array([15.0, 15.1])
+
+    e2 = WGS84_F * (2.0 - WGS84_F)
+    lat_rad = np.radians(56.0)
+    prime_vertical_m = WGS84_A_M / np.sqrt(1.0 - e2 * np.sin(lat_rad) ** 2)
+    true_distance_m = prime_vertical_m * np.cos(lat_rad) * np.radians(0.1)
+
+    def distance_m(mode):
+        x, y = LocalProjection(48.0, 10.0, mode=mode).to_xy(lat, lon)
+        return np.hypot(x[1] - x[0], y[1] - y[0])
+
+    assert abs(distance_m("enu") / true_distance_m - 1.0) < 0.005
+    assert abs(distance_m("flat") / true_distance_m - 1.0) > 0.1
+
+
+def test_enu_cpa_far_from_reference():
+    """
+    A head-on encounter far from the reference point keeps its CPA in
+    ENU mode, because velocities are rotated into the reference frame.
+    """
+    snapshot = pd.DataFrame({
+        "icao24": ["a", "b", "ref"],
+        "lat": [50.0, 50.0, 50.0],
+        "lon": [30.0, 30.28, 0.0],
+        "velocity": [200.0, 200.0, 200.0],
+        "heading": [90.0, 270.0, 0.0],
+        "baroaltitude": [10_000.0, 10_000.0, 3_000.0],
+        "vertrate": [0.0, 0.0, 0.0],
+    })
+
+    flat = find_conflict(detect_conflicts(snapshot, projection="flat"), "a", "b")
+    enu = find_conflict(detect_conflicts(snapshot, projection="enu"), "a", "b")
+
+    assert flat["d_cpa_nm"] < 0.01 and enu["d_cpa_nm"] < 0.01
+    assert abs(enu["t_cpa"] / flat["t_cpa"] - 1.0) < 0.005
+
+
+def test_enu_matches_flat_near_reference():
+    """
+    Close to the reference point both projections find the same
+    head-on conflict.
+    """
+    snapshot = pd.DataFrame({
+        "icao24": ["a", "b"],
+        "lat": [0.0, 0.0],
+        "lon": [0.0, 0.09],
+        "velocity": [100.0, 100.0],
+        "heading": [90.0, 270.0],
+        "baroaltitude": [10_000.0, 10_000.0],
+        "vertrate": [0.0, 0.0],
+    })
+
+    flat = find_conflict(detect_conflicts(snapshot, projection="flat"), "a", "b")
+    enu = find_conflict(detect_conflicts(snapshot, projection="enu"), "a", "b")
+
+    assert enu["d_cpa_nm"] < 5.0
+    assert np.isclose(enu["t_cpa"], flat["t_cpa"], rtol=1e-2)
@@ -0,0 +1,32 @@
+import logging
+from src.domain.cpa import DetectionStats, detect_conflicts
+from src.instrumentation import PipelineTrace, span
+from src.tests.helpers import make_random_snapshot
+
+
+def test_trace_records_spans_counters_and_log_records(caplog):
+    """
+    Spans are recorded in run order, detector counters are attached and
+    every value is available on the emitted log records.
+    """
+    trace = PipelineTrace()
+    stats = DetectionStats()
+
+    with span(trace, "snapshot"):
+        snapshot = make_random_snapshot(200)
+    with span(trace, "detect_conflicts"):
+        conflicts = detect_conflicts(snapshot, stats=stats)
+    with span(None, "ignored"):
+        pass
+    trace.record_stats(stats)
+
+    with caplog.at_level(logging.INFO, logger="aircpa.pipeline"):
+        trace.log()
+
+    assert [record["stage"] for record in trace.to_records()] == ["snapshot", "detect_conflicts"]
+    assert trace.counters["conflicts"] == len(conflicts)
+    assert trace.counters["total_pairs"] == 200 * 199 // 2
+
+    stages = [record.stage for record in caplog.records if hasattr(record, "stage")]
+    assert stages == ["snapshot", "detect_conflicts"]
+    assert caplog.records[-1].counters["conflicts"] == len(conflicts)
@@ -0,0 +1,138 @@
+import asyncio
+import time
+import pandas as pd
+from src.domain.cpa import detect_conflicts
+from src.replay import (
+    FileReplay,
+    LatestStateTable,
+    ReplayPipeline,
+    read_socket,
+    start_replay_server,
+)
+from src.tests.helpers import make_random_snapshot
+
+
+def make_recording(path, steps=5, n=80):
+    frames = []
+    for k in range(steps):
+        snapshot = make_random_snapshot(n, seed=k)
+        snapshot["time"] = 1_000 + 10 * k
+        snapshot["callsign"] = ""
+        frames.append(snapshot)
+    states = pd.concat(frames, ignore_index=True)
+    states.to_csv(path, index=False)
+    return states
+
+
+def state(icao, t, lat=50.0):
+    return {
+        "icao24": icao, "time": t, "lat": lat, "lon": 8.0, "velocity": 200.0,
+        "heading": 90.0, "baroaltitude": 10_000.0, "vertrate": 0.0,
+    }
+
+
+def test_state_table_is_bounded_and_keeps_latest():
+    """
+    The table keeps the newest state per aircraft, evicts the stalest
+    aircraft when full and drops states that aged out.
+    """
+    table = LatestStateTable(capacity=2, max_age_s=30)
+    table.update(state("a", 10, lat=50.0))
+    table.update(state("b", 20))
+    assert not table.update(state("a", 5, lat=99.0))
+    table.update(state("c", 25))
+
+    assert len(table) == 2 and table.evictions == 1
+    snapshot = table.snapshot(now=25)
+    assert sorted(snapshot.icao24) == ["b", "c"]
+
+    assert list(table.snapshot(now=52).icao24) == ["c"]
+
+
+def test_state_table_default_cutoff_is_a_minute():
+    """
+    By default the replay keeps states for a minute, longer than the
+    alignment limit of batch snapshots.
+    """
+    table = LatestStateTable()
+    table.update(state("a", 0))
+    table.update(state("b", 30))
+
+    assert sorted(table.snapshot(now=60).icao24) == ["a", "b"]
+    assert list(table.snapshot(now=61).icao24) == ["b"]
+
+
+def test_replay_publishes_conflicts_of_last_snapshot(tmp_path):
+    """
+    An unthrottled replay ends with the conflicts of the final snapshot,
+    and every cycle reaches subscribers.
+    """
+    states = make_recording(tmp_path / "states.csv")
+
+    async def run():
+        pipeline = ReplayPipeline(cadence_s=0.01)
+        updates = pipeline.subscribe(maxsize=1_000)
+        stats = await pipeline.run(FileReplay(str(tmp_path / "states.csv"), speed=float("inf")))
+        received = [updates.get_nowait() for _ in range(updates.qsize())]
+        return stats, received
+
+    stats, received = asyncio.run(run())
+
+    assert stats.messages == len(states)
+    assert len(received) == stats.cycles
+    last = received[-1]
+    expected = detect_conflicts(states[states["time"] == states["time"].max()])
+    assert len(expected) > 0
+    assert last.feed_time == states["time"].max()
+    assert set(last.conflicts.index) == set(expected.index)
+    assert stats.max_latency_s >= 0
+
+
+def test_socket_clients_each_get_the_full_feed(tmp_path):
+    """
+    Every client of the replay server receives all messages unchanged
+    and in order.
+    """
+    states = make_recording(tmp_path / "states.csv", steps=2, n=10)
+
+    async def run():
+        server = await start_replay_server(
+            lambda: FileReplay(str(tmp_path / "states.csv"), speed=float("inf")),
+            "127.0.0.1", 0,
+        )
+        port = server.sockets[0].getsockname()[1]
+
+        async def consume():
+            return [message async for message in read_socket("127.0.0.1", port)]
+
+        async with server:
+            return await asyncio.gather(consume(), consume())
+
+    for messages in asyncio.run(run()):
+        assert len(messages) == len(states)
+        assert messages[0]["icao24"] == states["icao24"].iloc[0]
+        assert messages[-1]["lat"] == states["lat"].iloc[-1]
+
+
+def test_detection_cadence_does_not_drift():
+    """
+    Detection ticks follow the cadence even when each detection takes
+    a good part of it.
+    """
+    async def source():
+        yield state("a", 10)
+        await asyncio.sleep(1.0)
+
+    pipeline = ReplayPipeline(cadence_s=0.2)
+    detect = pipeline.detector.detect
+
+    def slow_detect(*args):
+        time.sleep(0.1)
+        return detect(*args)
+
+    pipeline.detector.detect = slow_detect
+    stats = asyncio.run(pipeline.run(source()))
+
+    # Four or five ticks in one second plus the final detection; a period
+    # of cadence + detection time would give at most four in total
+    assert stats.cycles >= 5
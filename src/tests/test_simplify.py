@@ -0,0 +1,62 @@
+import numpy as np
+from src.ui.utils import _local_xy, fit_point_budget, simplify_path, simplify_paths
+
+
+def make_track(n=200, seed=0):
+    """
+    Helper for a wandering [lon, lat] track with ~500 m steps.
+    """
+    rng = np.random.default_rng(seed)
+    heading = np.cumsum(rng.normal(0.0, 0.2, n))
+    steps = np.column_stack((np.sin(heading) / 140, np.cos(heading) / 220))
+    return np.array([9.0, 50.0]) + np.cumsum(steps, axis=0)
+
+
+def segment_distances(points, path):
+    """Distance of every point to the nearest segment of a path [m]."""
+    xy = _local_xy(np.concatenate((path, points)))
+    p, a, b = xy[len(path):, None], xy[:len(path) - 1], xy[1:len(path)]
+    ab = b - a
+    t = np.clip(((p - a) * ab).sum(axis=-1) / (ab * ab).sum(axis=-1), 0, 1)
+    return np.hypot(*np.moveaxis(p - (a + t[..., None] * ab), -1, 0)).min(axis=1)
+
+
+def test_douglas_peucker_stays_within_tolerance():
+    """
+    Simplified tracks keep both ends, use fewer points for larger
+    tolerances and stay within the tolerance of every dropped point.
+    """
+    track = make_track()
+    previous = len(track)
+
+    for tolerance_m in (10, 100, 1_000):
+        simplified = simplify_path(track, tolerance_m)
+
+        np.testing.assert_array_equal(simplified[[0, -1]], track[[0, -1]])
+        assert len(simplified) < previous
+        assert segment_distances(track, simplified).max() <= tolerance_m * 1.001
+        previous = len(simplified)
+
+
+def test_batched_paths_and_point_budget():
+    """
+    Equal-length paths simplify as they do one by one, straight paths
+    reduce to their ends, and the budget is met in priority order.
+    """
+    tracks = np.stack([make_track(50, seed) for seed in range(5)])
+    straight = np.linspace([9.0, 50.0], [9.5, 50.2], 50)[None]
+    paths = np.concatenate((tracks, straight))
+
+    batched = simplify_paths(paths, 50)
+    for path, single in zip(batched, simplify_paths(list(paths), 50)):
+        np.testing.assert_array_equal(path, single)
+    assert len(batched[-1]) == 2
+
+    # Raising the tolerance is enough for a moderate budget
+    history, future = fit_point_budget([[make_track()], paths], 10, max_points=40)
+    assert sum(len(path) for path in history + future) <= 40
+    assert all(len(path) >= 2 for path in history + future)
+
+    # Beyond that, the last paths are dropped
+    history, future = fit_point_budget([[make_track()], paths], 10, max_points=9)
+    assert [len(path) for path in history + future] == [2, 2, 2, 2, 0, 0, 0]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from src.data.synthetic import Airway, Region, Tma, generate_states, initial_aircraft
+from src.domain.alignment import align_states
+
+
+def test_vectorized_motion_matches_step_loop():
+    """
+    Chunked, vectorized propagation matches stepping every aircraft in
+    a loop, independent of the chunk size.
+    """
+    rng = np.random.default_rng(0)
+    aircraft = initial_aircraft(7, Region(), [], 0.0, rng)
+
+    chunked = pd.concat(generate_states(aircraft, 0, 300, 10, rng, chunk_rows=20))
+    whole = pd.concat(generate_states(aircraft, 0, 300, 10, rng))
+
+    expected = []
+    lat = aircraft["lat"].to_numpy().copy()
+    lon = aircraft["lon"].to_numpy().copy()
+    heading_rad = np.radians(aircraft["heading"].to_numpy())
+    velocity = aircraft["velocity"].to_numpy()
+    for _ in range(30):
+        d_lat = velocity * np.cos(heading_rad) * 10 / 111_000
+        d_lon = velocity * np.sin(heading_rad) * 10 / (111_000 * np.cos(np.radians(lat)))
+        lat = lat + d_lat
+        lon = lon + d_lon
+        expected.append(np.column_stack((lat, lon)))
+    expected = np.concatenate(expected)
+
+    for states in (chunked, whole):
+        assert states["time"].tolist() == np.repeat(np.arange(0, 300, 10), 7).tolist()
+        assert np.allclose(states[["lat", "lon"]].to_numpy(), expected, rtol=0, atol=1e-9)
+
+
+def test_hotspots_concentrate_traffic():
+    """
+    Aircraft assigned to a TMA start inside it; airway traffic flies
+    along the airway at whole flight levels.
+    """
+    rng = np.random.default_rng(1)
+    tma = Tma(50.0, 8.5, radius_km=30.0)
+    airway = Airway(52.0, 10.0, 52.0, 12.0)
+
+    aircraft = initial_aircraft(2_000, Region(), [tma, airway], 1.0, rng)
+
+    north_m = (aircraft["lat"] - tma.lat) * 111_000
+    east_m = (aircraft["lon"] - tma.lon) * 111_000 * np.cos(np.radians(tma.lat))
+    in_tma = np.hypot(north_m, east_m) <= 30_000
+    on_airway = np.isin(np.round(aircraft["heading"]), [90, 270])
+
+    assert (in_tma | on_airway).all()
+    assert in_tma.sum() > 800 and on_airway.sum() > 800
+    levels_ft = aircraft.loc[on_airway & ~in_tma, "altitude"] / 0.3048 / 1_000
+    assert np.allclose(levels_ft, np.round(levels_ft))
+
+
+def test_generated_positions_need_no_alignment():
+    """
+    Generated positions are valid at the snapshot time, so aligning
+    them leaves every state unchanged.
+    """
+    rng = np.random.default_rng(2)
+    aircraft = initial_aircraft(50, Region(), [], 0.0, rng)
+    states = pd.concat(generate_states(aircraft, 0, 120, 10, rng), ignore_index=True)
+
+    pd.testing.assert_frame_equal(align_states(states), states)
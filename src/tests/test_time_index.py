@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data.time_index import TimeIndex
+
+
+def test_snapshots_match_boolean_selection():
+    """
+    Every snapshot slice has the same rows, in the same order, as
+    filtering the unsorted frame by time.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "time": rng.choice([30, 10, 20, 40], size=200),
+        "icao24": [f"{k:06x}" for k in range(200)],
+        "lat": rng.uniform(47.0, 55.0, 200),
+    })
+
+    index = TimeIndex.from_frame(df)
+
+    assert index.times.tolist() == [10, 20, 30, 40]
+    for t in index.times:
+        snapshot = index.snapshot(t)
+        expected = df[df["time"] == t]
+
+        assert snapshot["icao24"].tolist() == expected["icao24"].tolist()
+        assert np.shares_memory(snapshot["lat"].to_numpy(), index.df["lat"].to_numpy())
+
+    with pytest.raises(KeyError):
+        index.snapshot(25)
+
+
+def test_empty_frame_has_no_snapshots():
+    """
+    An empty frame gives an empty index.
+    """
+    index = TimeIndex.from_frame(pd.DataFrame({"time": [], "lat": []}))
+
+    assert len(index) == 0
+    assert len(index.starts) == len(index.ends) == 0
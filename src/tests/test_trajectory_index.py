@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from src.data.trajectory_index import TrajectoryIndex
+
+
+def make_states():
+    """
+    Helper to create shuffled states for a few aircraft.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "time": np.repeat(np.arange(0, 100, 10), 4),
+        "icao24": np.tile(["a", "b", "c", "d"], 10),
+        "lat": rng.uniform(47.0, 55.0, 40),
+        "lon": rng.uniform(5.0, 15.0, 40),
+    })
+    return df[(df["time"] < 50) | (df["icao24"] != "d")].sample(frac=1.0, random_state=0)
+
+
+def test_history_matches_filtering():
+    """
+    History up to t equals filtering the full frame by time and aircraft.
+    """
+    df = make_states()
+    index = TrajectoryIndex.from_frame(df)
+
+    for icao in ["a", "b", "c", "d", "unknown"]:
+        for t in (-5, 0, 35, 40, 200):
+            history = index.history(icao, t)
+            expected = df[(df["time"] <= t) & (df["icao24"] == icao)].sort_values("time")
+
+            assert history["time"].tolist() == expected["time"].tolist()
+            assert history["lat"].tolist() == expected["lat"].tolist()
+
+
+def test_last_position_for_aircraft_missing_from_snapshot():
+    """
+    Aircraft without a state at t report their last earlier position.
+    """
+    df = make_states()
+    index = TrajectoryIndex.from_frame(df)
+
+    last = df[(df["icao24"] == "d") & (df["time"] <= 70)].sort_values("time").iloc[-1]
+
+    assert index.last_position("d", 70) == (last["lat"], last["lon"])
+    assert index.last_position("a", -1) is None
+    assert index.last_position("unknown", 70) is None
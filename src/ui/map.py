@@ -1,16 +1,41 @@
 import streamlit as st
 import pydeck as pdk
 import numpy as np
-from src.domain.aircraft import AircraftState
-from src.ui.utils import project_future_positions, get_view_center
+from src.domain.aircraft import TrafficSnapshot
+from src.domain.cpa import find_conflict
+from src.ui.utils import (
+    fit_point_budget,
+    get_view_center,
+    project_future_paths,
+    simplification_tolerance_m,
+)
 from src.domain.geometry import xy_to_lonlat
+from src.instrumentation import span
+from src.constants import MAP_COORDINATE_DECIMALS, MAP_POINT_BUDGET
+
+
+def _marker_data(snapshot):
+    """Only the columns the markers and the tooltip use, with rounded positions."""
+    return snapshot[["icao24", "callsign"]].assign(
+        lon=snapshot["lon"].astype(np.float64).round(MAP_COORDINATE_DECIMALS),
+        lat=snapshot["lat"].astype(np.float64).round(MAP_COORDINATE_DECIMALS),
+    )
+
+
+def _path_data(paths):
+    """PathLayer records for non-empty [lon, lat] arrays, with rounded positions."""
+    return [
+        {"path": np.round(path, MAP_COORDINATE_DECIMALS).tolist()}
+        for path in paths
+        if len(path)
+    ]
 
 
 def create_base_layer(snapshot):
     """Create base aircraft layer showing all aircraft."""
     return pdk.Layer(
         "ScatterplotLayer",
-        data=snapshot,
+        data=_marker_data(snapshot),
         get_position="[lon, lat]",
         get_radius=1600,
         get_fill_color=[0, 110, 200, 140],
@@ -18,29 +43,39 @@ def create_base_layer(snapshot):
     )
 
 
-def create_trajectory_layer(df, icao, current_time, color):
+def history_path(trajectories, icao, current_time):
     """
-    Create historical trajectory layer for an aircraft.
+    Historical path of an aircraft.
 
     Args:
-        df: Full dataframe
+        trajectories: TrajectoryIndex of the full dataset
         icao: Aircraft ICAO24
         current_time: Current timestamp
+
+    Returns:
+        Array of shape (n, 2) with [lon, lat] points
+    """
+    history = trajectories.history(icao, current_time)
+    return history[["lon", "lat"]].to_numpy(dtype=np.float64)
+
+
+def create_trajectory_layer(path, color):
+    """
+    Create historical trajectory layer for an aircraft.
+
+    Args:
+        path: Array of [lon, lat] points, e.g. from :func:`history_path`
         color: RGBA color for the trajectory
 
     Returns:
         PyDeck Layer or None
     """
-    time_window = df[df["time"] <= current_time]
-    history = time_window[time_window["icao24"] == icao].copy()
-
-    if history.empty:
+    if not len(path):
         return None
 
-    history = history.sort_values("time")
     return pdk.Layer(
         "PathLayer",
-        data=[{"path": history[["lon", "lat"]].values.tolist()}],
+        data=_path_data([path]),
         get_path="path",
         get_color=color,
         width_scale=1,
@@ -60,7 +95,7 @@ def create_selected_aircraft_layer(snapshot, a_id, b_id):
 
     return pdk.Layer(
         "ScatterplotLayer",
-        data=selected_data,
+        data=_marker_data(selected_data),
         get_position="[lon, lat]",
         get_radius=1600,
         get_fill_color=[220, 20, 60, 230],
@@ -68,39 +103,46 @@ def create_selected_aircraft_layer(snapshot, a_id, b_id):
     )
 
 
-def create_future_trajectory_layer(snapshot, icao, lookahead):
+def select_future_paths(snapshot, lookahead, icao_ids=None):
     """
-    Create future trajectory layer for an aircraft.
+    Projected future paths of many aircraft.
 
     Args:
         snapshot: Current snapshot DataFrame
-        icao: Aircraft ICAO24
         lookahead: Look-ahead time in seconds
+        icao_ids: ICAO24 identifiers to project, or None for all aircraft
 
     Returns:
-        PyDeck Layer or None
+        Array of shape (N, steps, 2) with [lon, lat] points, without
+        aircraft whose motion is unknown
     """
-    if icao not in snapshot["icao24"].values:
-        return None
+    traffic = TrafficSnapshot.from_frame(snapshot)
+    projection = traffic.projection()
 
-    row = snapshot[snapshot["icao24"] == icao].iloc[0]
-    aircraft_state = AircraftState(
-        icao, row["lat"], row["lon"],
-        row["velocity"], row["heading"],
-        row["baroaltitude"], row["vertrate"]
-    )
+    if icao_ids is not None:
+        traffic = traffic.take(np.isin(traffic.icao24, list(icao_ids)))
 
-    lat0 = snapshot["lat"].mean()
-    lon0 = snapshot["lon"].mean()
+    paths = project_future_paths(traffic, projection, lookahead)
+    return paths[np.isfinite(paths).all(axis=(1, 2))]
+
+
+def create_future_paths_layer(paths):
+    """
+    Create one layer with the projected future paths of many aircraft.
 
-    future_points = project_future_positions(aircraft_state, lat0, lon0, lookahead)
+    Args:
+        paths: [lon, lat] point arrays, e.g. from :func:`select_future_paths`
 
-    if not future_points:
+    Returns:
+        PyDeck Layer or None
+    """
+    data = _path_data(paths)
+    if not data:
         return None
 
     return pdk.Layer(
         "PathLayer",
-        data=[{"path": future_points}],
+        data=data,
         get_path="path",
         get_color=[128, 128, 128, 120],
         width_scale=1,
@@ -127,15 +169,10 @@ def create_cpa_circle_layer(conflict_df, a_id, b_id, snapshot, sep_m):
     if a_id not in snapshot["icao24"].values or b_id not in snapshot["icao24"].values:
         return None
 
-    conflict = conflict_df[
-        ((conflict_df["a"] == a_id) & (conflict_df["b"] == b_id)) |
-        ((conflict_df["a"] == b_id) & (conflict_df["b"] == a_id))
-    ]
-
-    if conflict.empty:
+    row = find_conflict(conflict_df, a_id, b_id)
+    if row is None:
         return None
 
-    row = conflict.iloc[0]
     lat0 = snapshot["lat"].mean()
     lon0 = snapshot["lon"].mean()
 
@@ -150,61 +187,91 @@ def create_cpa_circle_layer(conflict_df, a_id, b_id, snapshot, sep_m):
     )
 
 
-def render_map(snapshot, df, current_time, conflict_df, a_id, b_id, lookahead, sep_m):
+def render_map(
+    snapshot, trajectories, current_time, conflict_df, a_id, b_id, lookahead, sep_m,
+    future_paths="selected", trace=None,
+):
     """
     Render the air situation map.
 
     Args:
         snapshot: Current snapshot DataFrame
-        df: Full dataframe
+        trajectories: TrajectoryIndex of the full dataset
         current_time: Current timestamp
         conflict_df: DataFrame of conflicts
         a_id: First selected aircraft ICAO24
         b_id: Second selected aircraft ICAO24
         lookahead: Look-ahead time in seconds
         sep_m: Separation distance in meters
+        future_paths: Projected paths to show: "selected" pair, aircraft
+            in "conflicts", or "all" aircraft
+        trace: Optional PipelineTrace for stage timings
     """
     st.subheader("Air Situation Map")
 
-    layers = []
-
-    # Base layer - all aircraft
-    layers.append(create_base_layer(snapshot))
-
-    # If aircraft are selected, add their layers
-    if a_id and b_id:
-        # Historical trajectories
-        traj_a = create_trajectory_layer(df, a_id, current_time, [255, 100, 100, 150])
-        if traj_a:
-            layers.append(traj_a)
-
-        traj_b = create_trajectory_layer(df, b_id, current_time, [100, 100, 255, 150])
-        if traj_b:
-            layers.append(traj_b)
-
-        # Highlight selected aircraft
-        selected_layer = create_selected_aircraft_layer(snapshot, a_id, b_id)
-        if selected_layer:
-            layers.append(selected_layer)
-
-        # Future trajectories
-        future_a = create_future_trajectory_layer(snapshot, a_id, lookahead)
-        if future_a:
-            layers.append(future_a)
-
-        future_b = create_future_trajectory_layer(snapshot, b_id, lookahead)
-        if future_b:
-            layers.append(future_b)
+    with span(trace, "map_layers"):
+        # Calculate view center; paths are simplified to its zoom level
+        view_lat, view_lon, view_zoom = get_view_center(
+            snapshot, a_id, b_id, trajectories, current_time
+        )
+        tolerance_m = simplification_tolerance_m(view_zoom, view_lat)
+
+        pair_selected = bool(a_id and b_id)
+
+        # Future trajectories for the chosen aircraft
+        if future_paths == "all":
+            icao_ids = None
+        elif future_paths == "conflicts":
+            icao_ids = set(conflict_df["a"]) | set(conflict_df["b"])
+        else:
+            icao_ids = {a_id, b_id} if pair_selected else set()
+        future = select_future_paths(snapshot, lookahead, icao_ids)
+
+        # Historical trajectories of the selected pair
+        history = [
+            history_path(trajectories, icao, current_time) for icao in (a_id, b_id)
+        ] if pair_selected else []
+
+        # Every aircraft marker is one point; paths share the rest
+        history, future = fit_point_budget(
+            [history, future], tolerance_m, max(MAP_POINT_BUDGET - len(snapshot), 0)
+        )
+
+        layers = []
+
+        # Base layer - all aircraft
+        layers.append(create_base_layer(snapshot))
+
+        # If aircraft are selected, add their layers
+        if pair_selected:
+            traj_a = create_trajectory_layer(history[0], [255, 100, 100, 150])
+            if traj_a:
+                layers.append(traj_a)
+
+            traj_b = create_trajectory_layer(history[1], [100, 100, 255, 150])
+            if traj_b:
+                layers.append(traj_b)
+
+            # Highlight selected aircraft
+            selected_layer = create_selected_aircraft_layer(snapshot, a_id, b_id)
+            if selected_layer:
+                layers.append(selected_layer)
+
+        # Future trajectories, all in one layer
+        future_layer = create_future_paths_layer(future)
+        if future_layer:
+            layers.append(future_layer)
 
         # CPA circle
-        cpa_layer = create_cpa_circle_layer(conflict_df, a_id, b_id, snapshot, sep_m)
-        if cpa_layer:
-            layers.append(cpa_layer)
+        if pair_selected:
+            cpa_layer = create_cpa_circle_layer(conflict_df, a_id, b_id, snapshot, sep_m)
+            if cpa_layer:
+                layers.append(cpa_layer)
 
-    # Calculate view center
-    view_lat, view_lon, view_zoom = get_view_center(
-        snapshot, a_id, b_id, df, current_time
-    )
+    if trace is not None:
+        trace.counters["map_points"] = len(snapshot) + sum(
+            len(path) for path in history + future
+        )
 
     # Create and render deck
     deck = pdk.Deck(
@@ -217,4 +284,5 @@ def render_map(snapshot, df, current_time, conflict_df, a_id, b_id, lookahead, s
         tooltip={"text": "ICAO: {icao24}\nCallsign: {callsign}"}
     )
 
-    st.pydeck_chart(deck, height=600)
+    with span(trace, "map_render"):
+        st.pydeck_chart(deck, height=600)
@@ -2,6 +2,13 @@ import streamlit as st
 import pandas as pd
 
 
+FUTURE_PATH_OPTIONS = {
+    "selected": "Selected pair",
+    "conflicts": "Aircraft in conflict",
+    "all": "All aircraft",
+}
+
+
 def render_time_controls(times: list) -> int:
     """
     Render time selection slider and navigation buttons.
@@ -86,9 +93,46 @@ def render_configuration_controls() -> tuple:
     )
     st.session_state.sep_ft = sep_ft
 
+    st.sidebar.selectbox(
+        "Projected paths",
+        options=list(FUTURE_PATH_OPTIONS),
+        format_func=FUTURE_PATH_OPTIONS.get,
+        key="future_paths",
+        help="Straight-line paths over the look-ahead horizon."
+    )
+
+    st.sidebar.toggle(
+        "Show pipeline timings",
+        key="debug_timings",
+        help="Record stage timings and detector counters, log them and "
+             "show them at the bottom of the sidebar."
+    )
+
     return lookahead, sep_nm, sep_ft
 
 
+def render_debug_panel(trace):
+    """
+    Render stage timings and detector counters at the bottom of the sidebar.
+
+    Args:
+        trace: PipelineTrace of the current rerun
+    """
+    with st.sidebar.expander("Pipeline timings", expanded=True):
+        timings = pd.DataFrame(trace.to_records())
+        st.dataframe(
+            timings.style.format({"duration_ms": "{:.1f}"}),
+            hide_index=True,
+            use_container_width=True
+        )
+        st.caption(f"Total: {trace.total_s * 1e3:.1f} ms")
+
+        counters = pd.DataFrame(
+            list(trace.counters.items()), columns=["counter", "value"]
+        )
+        st.dataframe(counters, hide_index=True, use_container_width=True)
+
+
 def render_sidebar(times: list) -> tuple:
     """
     Render the entire sidebar with time controls and configuration controls.
@@ -1,5 +1,6 @@
 import streamlit as st
 from src.constants import DEFAULT_LOOKAHEAD_S, DEFAULT_HORIZONTAL_SEP_NM, DEFAULT_VERTICAL_SEP_FT
+from src.domain.cpa import VerletConflictDetector
 
 
 def init_session_state():
@@ -9,6 +10,11 @@ def init_session_state():
         "lookahead": DEFAULT_LOOKAHEAD_S,
         "sep_nm": DEFAULT_HORIZONTAL_SEP_NM,
         "sep_ft": DEFAULT_VERTICAL_SEP_FT,
+        "conflict_detector": VerletConflictDetector(),
+        "future_paths": "selected",
+        "conflict_sort": "t_cpa",
+        "conflict_page": 1,
+        "debug_timings": False,
     }
 
     for key, value in defaults.items():
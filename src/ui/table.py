@@ -1,6 +1,15 @@
 import streamlit as st
 import pandas as pd
+from src.domain.cpa import find_conflict, rank_conflicts
 from src.ui.utils import create_callsign_map, label_aircraft
+from src.constants import TABLE_PAGE_SIZE
+
+
+SORT_OPTIONS = {
+    "t_cpa": "Time to CPA",
+    "d_cpa_nm": "Horizontal separation",
+    "vert_sep_ft": "Vertical separation",
+}
 
 
 def render_selection_status(a_id, b_id, conflict_df, label_func):
@@ -16,12 +25,7 @@ def render_selection_status(a_id, b_id, conflict_df, label_func):
     if not a_id or not b_id:
         return
 
-    pair_conflict = conflict_df[
-        ((conflict_df["a"] == a_id) & (conflict_df["b"] == b_id)) |
-        ((conflict_df["a"] == b_id) & (conflict_df["b"] == a_id))
-    ]
-
-    is_conflict = not pair_conflict.empty
+    is_conflict = find_conflict(conflict_df, a_id, b_id) is not None
     status_text = "Conflict predicted" if is_conflict else "No conflict"
 
     with st.container(border=True):
@@ -47,9 +51,49 @@ def render_selection_status(a_id, b_id, conflict_df, label_func):
                 st.rerun()
 
 
+def render_table_controls(n_conflicts):
+    """
+    Render sort and page controls for the conflict table.
+
+    Args:
+        n_conflicts: Number of conflicts in the table
+
+    Returns:
+        Tuple of (severity key, offset of the first row on the page)
+    """
+    n_pages = max(-(-n_conflicts // TABLE_PAGE_SIZE), 1)
+
+    # Fewer conflicts than before can leave the stored page out of range
+    if st.session_state.conflict_page > n_pages:
+        st.session_state.conflict_page = n_pages
+
+    col_sort, col_page = st.columns([3, 1])
+
+    with col_sort:
+        by = st.selectbox(
+            "Sort by",
+            options=list(SORT_OPTIONS),
+            format_func=SORT_OPTIONS.get,
+            key="conflict_sort"
+        )
+
+    with col_page:
+        page = st.number_input(
+            f"Page (of {n_pages})",
+            min_value=1,
+            max_value=n_pages,
+            step=1,
+            key="conflict_page"
+        )
+
+    return by, (page - 1) * TABLE_PAGE_SIZE
+
+
 def render_conflict_table(conflict_df, label_func, a_id, b_id):
     """
-    Render the conflict table with selection handling.
+    Render one page of the conflict table with selection handling.
+
+    Only the conflicts on the page are ranked in order, labelled and styled.
 
     Args:
         conflict_df: DataFrame of conflicts
@@ -64,29 +108,25 @@ def render_conflict_table(conflict_df, label_func, a_id, b_id):
         st.caption("No predicted conflicts at this time.")
         return None, None
 
-    display_df = conflict_df.copy()
-    display_df["Aircraft A"] = display_df["a"].apply(label_func)
-    display_df["Aircraft B"] = display_df["b"].apply(label_func)
-    display_df["Time to CPA (s)"] = display_df["t_cpa"].round(1)
-    display_df["Horizontal Sep (NM)"] = display_df["d_cpa_nm"].round(2)
-    display_df["Vertical Sep (ft)"] = display_df["vert_sep_ft"].round(0)
-
-    # Sort by smallest time to CPA
-    display_df = display_df.sort_values("Time to CPA (s)")
-
-    # Select columns for display
-    table_df = display_df[["Aircraft A", "Aircraft B",
-                           "Time to CPA (s)", "Horizontal Sep (NM)", "Vertical Sep (ft)"]].copy()
-
-    # Create highlighting for selected pair
-    selected_mask = (
-        ((display_df["a"] == a_id) & (display_df["b"] == b_id)) |
-        ((display_df["a"] == b_id) & (display_df["b"] == a_id))
-    )
+    by, offset = render_table_controls(len(conflict_df))
+    page_df = rank_conflicts(conflict_df, TABLE_PAGE_SIZE, by=by, offset=offset)
+
+    table_df = pd.DataFrame({
+        "Aircraft A": [label_func(a) for a in page_df["a"]],
+        "Aircraft B": [label_func(b) for b in page_df["b"]],
+        "Time to CPA (s)": page_df["t_cpa"].round(1).to_numpy(),
+        "Horizontal Sep (NM)": page_df["d_cpa_nm"].round(2).to_numpy(),
+        "Vertical Sep (ft)": page_df["vert_sep_ft"].round(0).to_numpy(),
+    })
+
+    # Highlight the selected pair if it is on this page
+    selected_pairs = {(a_id, b_id), (b_id, a_id)}
+    selected_rows = [
+        i for i, pair in enumerate(zip(page_df["a"], page_df["b"])) if pair in selected_pairs
+    ]
 
     def highlight_selected(row):
-        idx = row.name
-        if selected_mask.loc[idx]:
+        if row.name in selected_rows:
             return ['background-color: rgba(120, 120, 120, 0.15)'] * len(row)
         return [''] * len(row)
 
@@ -108,12 +148,15 @@ def render_conflict_table(conflict_df, label_func, a_id, b_id):
         selection_mode="single-row"
     )
 
+    st.caption(
+        f"Showing {offset + 1:,}–{offset + len(page_df):,} of {len(conflict_df):,} conflicts"
+    )
+
     # Handle row selection
     if event.selection.rows:
         i = event.selection.rows[0]
-        selected_row = display_df.iloc[i]
-        new_a = selected_row["a"]
-        new_b = selected_row["b"]
+        new_a = page_df["a"].iloc[i]
+        new_b = page_df["b"].iloc[i]
 
         if a_id != new_a or b_id != new_b:
             return new_a, new_b
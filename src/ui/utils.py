@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
-from src.constants import EARTH_RADIUS_M
+from src.constants import EARTH_RADIUS_M, MAP_SIMPLIFY_PIXELS
+
+# Web Mercator ground resolution at zoom 0, for deck.gl's 512 px tiles
+_METERS_PER_PIXEL_ZOOM_0 = 2 * np.pi * EARTH_RADIUS_M / 512
 
 
 def create_callsign_map(snapshot: pd.DataFrame) -> dict:
@@ -13,7 +16,8 @@ def create_callsign_map(snapshot: pd.DataFrame) -> dict:
     Returns:
         Dictionary mapping ICAO24 to callsign
     """
-    return snapshot.set_index("icao24")["callsign"].fillna("").to_dict()
+    callsigns = snapshot["callsign"].astype(object).fillna("")
+    return dict(zip(snapshot["icao24"].astype(object), callsigns))
 
 
 def label_aircraft(icao: str, callsign_map: dict) -> str:
@@ -31,33 +35,168 @@ def label_aircraft(icao: str, callsign_map: dict) -> str:
     return f"{cs}" if cs else icao
 
 
-def project_future_positions(aircraft_state, lat0, lon0, lookahead, step=10):
+def project_future_paths(traffic, projection, lookahead, step=10, with_altitude=False):
     """
-    Project future positions of an aircraft.
+    Project straight-line future paths of all aircraft at once.
 
     Args:
-        aircraft_state: AircraftState object
-        lat0: Reference latitude for projection
-        lon0: Reference longitude for projection
+        traffic: TrafficSnapshot of the aircraft to project
+        projection: LocalProjection used for the straight-line extrapolation
         lookahead: Look-ahead time in seconds
         step: Time step in seconds for sampling
+        with_altitude: Also extrapolate the altitude with the vertical rate
 
     Returns:
-        List of [lon, lat] coordinates
+        Array of shape (N, steps, 2) with [lon, lat] points, or
+        (N, steps, 3) with [lon, lat, altitude_m] points
     """
-    future_points = []
     time_steps = np.arange(0, lookahead + 1, step)
 
-    for dt in time_steps:
-        future_pos = aircraft_state.position_xy(lat0, lon0) + aircraft_state.velocity_vector() * dt
-        future_lon = lon0 + (future_pos[0] / (EARTH_RADIUS_M * np.cos(np.radians(lat0)))) * 180 / np.pi
-        future_lat = lat0 + (future_pos[1] / EARTH_RADIUS_M) * 180 / np.pi
-        future_points.append([future_lon, future_lat])
+    x_m, y_m = traffic.position_xy(projection)
+    vx_mps, vy_mps = traffic.velocity_xy(projection)
+    future_lon, future_lat = projection.to_lonlat(
+        x_m[:, None] + vx_mps[:, None] * time_steps,
+        y_m[:, None] + vy_mps[:, None] * time_steps,
+    )
+
+    if with_altitude:
+        future_altitude = (
+            traffic.altitude_m[:, None] + traffic.vertical_rate_mps[:, None] * time_steps
+        )
+        return np.stack((future_lon, future_lat, future_altitude), axis=-1)
+
+    return np.stack((future_lon, future_lat), axis=-1)
+
+
+def simplification_tolerance_m(zoom, lat, pixels=MAP_SIMPLIFY_PIXELS):
+    """
+    Ground distance covered by a number of screen pixels.
+
+    Args:
+        zoom: Map zoom level
+        lat: Latitude of the view centre
+        pixels: Tolerance in screen pixels
+
+    Returns:
+        Distance in meters
+    """
+    return pixels * _METERS_PER_PIXEL_ZOOM_0 * np.cos(np.radians(lat)) / 2 ** zoom
+
 
-    return future_points
+def _local_xy(points):
+    """Flat-earth XY in meters of [lon, lat] points, per path."""
+    lat0 = np.radians(points[..., :1, 1:2])
+    return np.radians(points) * EARTH_RADIUS_M * np.concatenate(
+        (np.cos(lat0), np.ones_like(lat0)), axis=-1
+    )
 
 
-def get_view_center(snapshot, a_id=None, b_id=None, df=None, current_time=None):
+def _chord_distances(xy):
+    """Distances of all points to the chord from the first to the last point."""
+    start = xy[..., :1, :]
+    chord = xy[..., -1:, :] - start
+    offset = xy - start
+    length = np.hypot(chord[..., 0], chord[..., 1])
+    cross = np.abs(chord[..., 0] * offset[..., 1] - chord[..., 1] * offset[..., 0])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(length > 0, cross / length, np.hypot(offset[..., 0], offset[..., 1]))
+
+
+def simplify_path(points, tolerance_m):
+    """
+    Simplify a path with the Douglas-Peucker algorithm.
+
+    Args:
+        points: Array of shape (n, 2) with [lon, lat] points
+        tolerance_m: Maximum distance of dropped points from the result [m]
+
+    Returns:
+        Array of the kept points, always including both ends
+    """
+    if len(points) < 3:
+        return points
+
+    xy = _local_xy(points)
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distances = _chord_distances(xy[first:last + 1])
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance_m:
+            keep[first + farthest] = True
+            stack.extend(((first, first + farthest), (first + farthest, last)))
+
+    return points[keep]
+
+
+def simplify_paths(paths, tolerance_m):
+    """
+    Simplify many paths with the Douglas-Peucker algorithm.
+
+    Paths of equal length can be passed as one array; those that are
+    straight within the tolerance are then reduced to their ends in a
+    single vectorized step.
+
+    Args:
+        paths: Array of shape (N, steps, 2), or list of (n, 2) arrays
+        tolerance_m: Maximum distance of dropped points from the result [m]
+
+    Returns:
+        List of simplified (n, 2) arrays
+    """
+    if isinstance(paths, np.ndarray) and paths.ndim == 3 and paths.shape[1] > 2:
+        straight = _chord_distances(_local_xy(paths)).max(axis=1) <= tolerance_m
+        ends = paths[:, [0, -1]]
+        return [
+            ends[i] if straight[i] else simplify_path(paths[i], tolerance_m)
+            for i in range(len(paths))
+        ]
+
+    return [simplify_path(path, tolerance_m) for path in paths]
+
+
+def fit_point_budget(path_groups, tolerance_m, max_points):
+    """
+    Simplify groups of paths so that together they fit a point budget.
+
+    The tolerance is raised until the paths fit or cannot be simplified
+    further. If they still do not fit, paths are kept in priority order
+    while they fit and the rest are dropped.
+
+    Args:
+        path_groups: Path collections in priority order, each accepted by
+            :func:`simplify_paths`
+        tolerance_m: Initial simplification tolerance [m]
+        max_points: Maximum total number of points
+
+    Returns:
+        List with a list of simplified paths per group; dropped paths are
+        empty arrays
+    """
+    total = None
+    while True:
+        groups = [simplify_paths(paths, tolerance_m) for paths in path_groups]
+        previous, total = total, sum(len(path) for paths in groups for path in paths)
+        if total <= max_points or total == previous:
+            break
+        tolerance_m *= 4
+
+    remaining = max_points
+    for paths in groups:
+        for i, path in enumerate(paths):
+            if len(path) > remaining:
+                paths[i] = path[:0]
+            remaining -= len(paths[i])
+
+    return groups
+
+
+def get_view_center(snapshot, a_id=None, b_id=None, trajectories=None, current_time=None):
     """
     Calculate the view center for the map.
 
@@ -65,41 +204,31 @@ def get_view_center(snapshot, a_id=None, b_id=None, df=None, current_time=None):
         snapshot: Current snapshot DataFrame
         a_id: First selected aircraft ICAO24
         b_id: Second selected aircraft ICAO24
-        df: Full dataframe (for historical lookup)
+        trajectories: TrajectoryIndex (for historical lookup)
         current_time: Current timestamp
 
     Returns:
         Tuple of (latitude, longitude, zoom_level)
     """
-    # If both aircraft are selected
-    if a_id and b_id and df is not None and current_time is not None:
-        a_in_snapshot = a_id in snapshot["icao24"].values
-        b_in_snapshot = b_id in snapshot["icao24"].values
-
-        if a_in_snapshot and b_in_snapshot:
-            a_row = snapshot[snapshot["icao24"] == a_id].iloc[0]
-            b_row = snapshot[snapshot["icao24"] == b_id].iloc[0]
-            view_lat = np.mean([a_row["lat"], b_row["lat"]])
-            view_lon = np.mean([a_row["lon"], b_row["lon"]])
+    # If both aircraft are selected, centre on their last known positions
+    if a_id and b_id and trajectories is not None and current_time is not None:
+        positions = [
+            position
+            for position in (
+                trajectories.last_position(a_id, current_time),
+                trajectories.last_position(b_id, current_time),
+            )
+            if position is not None
+        ]
+
+        if positions:
+            view_lat = np.mean([p[0] for p in positions])
+            view_lon = np.mean([p[1] for p in positions])
             return view_lat, view_lon, 7.5
-        else:
-            # Try to find their last known positions
-            a_last = df[df["icao24"] == a_id][df["time"] <= current_time].sort_values("time").tail(1)
-            b_last = df[df["icao24"] == b_id][df["time"] <= current_time].sort_values("time").tail(1)
-
-            positions = []
-            if not a_last.empty:
-                positions.append((a_last.iloc[0]["lat"], a_last.iloc[0]["lon"]))
-            if not b_last.empty:
-                positions.append((b_last.iloc[0]["lat"], b_last.iloc[0]["lon"]))
-
-            if positions:
-                view_lat = np.mean([p[0] for p in positions])
-                view_lon = np.mean([p[1] for p in positions])
-                return view_lat, view_lon, 7.5
 
     # Default view
     if not snapshot.empty:
-        return snapshot["lat"].mean(), snapshot["lon"].mean(), 5.3
+        # Plain floats, so float32 columns stay JSON serializable
+        return float(snapshot["lat"].mean()), float(snapshot["lon"].mean()), 5.3
     else:
         return 51, 10, 5.3  # Central Europe